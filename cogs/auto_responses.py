@@ -1,8 +1,7 @@
 import discord
 from discord.ext import commands
 import random
-from utils.automation_manager import load_auto_responses
-from utils.json_manager import load_json_async
+from utils.corpus_manager import get_auto_reacts, get_autoresponse_quips
 
 class AutoResponses(commands.Cog):
     """
@@ -11,7 +10,6 @@ class AutoResponses(commands.Cog):
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.auto_reacts = load_auto_responses()
     
 
     # checks message content 
@@ -20,14 +18,10 @@ class AutoResponses(commands.Cog):
         if message.author.bot:
             return
         try:
-            self.auto_reacts = load_auto_responses()
-            for auto_react in self.auto_reacts[str(message.guild.id)]["auto_reacts"]:
-                trigger = auto_react["content"].lower().strip()
-                msg = message.content.lower().strip()
-
+            # triggers are pre-lowercased in the cached corpus
+            msg = message.content.lower().strip()
+            for trigger, emoji_raw in get_auto_reacts(message.guild.id):
                 if trigger in msg:
-                    emoji_raw = auto_react["emoji"]
-
                     # custom emoji format: <:name:id>
                     if emoji_raw.startswith("<:") and emoji_raw.endswith(">"):
                         parts = emoji_raw.strip("<>").split(":")  # ["", "name", "id"]
@@ -42,12 +36,9 @@ class AutoResponses(commands.Cog):
                         print(f"[AutoReact] Emoji not found: {emoji_raw}")
 
             # handle auto reply
-            data = await load_json_async("data/autoresponses.json")
-            quips = data.get("quips", {})
-            
-            for key in quips.keys():
-                if msg in key:
-                    message.reply(random.choice(quips[key]))
+            for key, lines in get_autoresponse_quips():
+                if key in msg:
+                    await message.reply(random.choice(lines))
                     break
 
         except Exception as e:
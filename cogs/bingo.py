@@ -1,22 +1,23 @@
-import asyncio
+from io import BytesIO
 from typing import Optional
 
 import discord
 from discord import app_commands
 from discord.ext import commands
 
-from utils.bingo_manager import create_board, get_board, render_board
+from utils.bingo_manager import BingoBoard, create_board, get_board
+from utils.render_manager import render_bingo_board
 
 
 class Bingo(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
-    async def _render_image(self, board: dict) :
-        buffer = await asyncio.to_thread(render_board, board)
-        return discord.File(buffer, filename="dew_bingo.png")
+    async def _render_image(self, board: BingoBoard) :
+        png = await render_bingo_board(board)
+        return discord.File(BytesIO(png), filename="dew_bingo.png")
 
-    async def _send_board(self, interaction: discord.Interaction, board: dict, notice: Optional[str] = None):
+    async def _send_board(self, interaction: discord.Interaction, board: BingoBoard, notice: Optional[str] = None):
         file = await self._render_image(board)
         if notice:
             await interaction.followup.send(content=notice, file=file, ephemeral=True)
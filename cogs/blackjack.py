@@ -1,51 +1,79 @@
+import uuid
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 from discord.ui import View, Button
-from utils.blackjack_manager import make_deck, score_hand, is_blackjack
+from utils.blackjack_manager import Hand, get_shoe
 from utils.booster_manager import check_boost_status
 from utils.economy_manager import EconomyManager
+from utils.session_manager import get_session_store
 import utils.blackjack_manager as bj
 from utils.cooldown_manager import *
 
+SESSION_KIND = "blackjack"
+# a hand idle this long (e.g. its view died in a restart) is refunded by the sweeper
+SESSION_TTL = 10 * 60
+
 class BlackjackView(View):
-    def __init__(self, bot, game):
-        super().__init__(timeout=60)
-        self.bot = bot
-        self.game = game
+    def __init__(self, cog, player_id, game_id, timeout=60):
+        super().__init__(timeout=timeout)
+        self.cog = cog
+        self.player_id = player_id
+        self.game_id = game_id
+        self.message = None
+        # per-game custom ids: re-registrable after a restart, and old hands can't drive a new one
+        self.hit.custom_id = f"blackjack:{game_id}:hit"
+        self.stand.custom_id = f"blackjack:{game_id}:stand"
+
+    @property
+    def game(self):
+        game = self.cog.active_games.get(self.player_id)
+        if game and game['id'] == self.game_id:
+            return game
+        return None
 
     async def on_timeout(self):
         # auto-stand on timeout
-        if not self.game['finished']:
-            await self.game['finish_func']()
+        game = self.game
+        if game and not game['finished']:
+            await self.cog.finish(game)
+            if self.message:
+                try:
+                    await self.message.edit(embed=self.cog.render(game), view=None)
+                except discord.HTTPException:
+                    pass
 
-    @discord.ui.button(label="Hit", style=discord.ButtonStyle.green)
-    async def hit(self, interaction: discord.Interaction, button: Button):
-        if interaction.user.id != self.game['player']:
+    async def _check(self, interaction: discord.Interaction):
+        if interaction.user.id != self.player_id:
             await interaction.response.send_message("This is not your game.", ephemeral=True)
-            return
-        if self.game['finished']:
+            return None
+        game = self.game
+        if not game or game['finished']:
             await interaction.response.send_message("Game already finished.", ephemeral=True)
+            return None
+        return game
+
+    @discord.ui.button(label="Hit", style=discord.ButtonStyle.green)
+    async def hit(self, interaction: discord.Interaction, button: Button):
+        game = await self._check(interaction)
+        if not game:
             return
         # draw card
-        card = self.game['deck'].pop()
-        self.game['player_cards'].append(card)
-        if score_hand(self.game['player_cards']) > 21:
-            await self.game['finish_func']()
-            await interaction.response.edit_message(embed=self.game['render'](), view=None)
+        game['player_hand'].add(get_shoe().draw())
+        if game['player_hand'].busted:
+            await self.cog.finish(game)
+            await interaction.response.edit_message(embed=self.cog.render(game), view=None)
             return
-        await interaction.response.edit_message(embed=self.game['render'](), view=self)
+        await self.cog.save_game(game)
+        await interaction.response.edit_message(embed=self.cog.render(game), view=self)
 
     @discord.ui.button(label="Stand", style=discord.ButtonStyle.blurple)
     async def stand(self, interaction: discord.Interaction, button: Button):
-        if interaction.user.id != self.game['player']:
-            await interaction.response.send_message("This is not your game.", ephemeral=True)
+        game = await self._check(interaction)
+        if not game:
             return
-        if self.game['finished']:
-            await interaction.response.send_message("Game already finished.", ephemeral=True)
-            return
-        await self.game['finish_func']()
-        await interaction.response.edit_message(embed=self.game['render'](), view=None)
+        await self.cog.finish(game)
+        await interaction.response.edit_message(embed=self.cog.render(game), view=None)
 
 
 class Blackjack(commands.Cog):
@@ -58,97 +86,160 @@ class Blackjack(commands.Cog):
             self.economy = EconomyManager(bot)
             bot.economy_manager = self.economy
         self.active_games = {}
+        self.sessions = get_session_store()
+
+    async def cog_load(self):
+        await self.restore_games()
+        self.sweep_sessions.start()
+
+    async def cog_unload(self):
+        self.sweep_sessions.cancel()
 
     def create_game(self, player_id: int, bet: int):
-        deck = make_deck()
-        player_cards = [deck.pop(), deck.pop()]
-        dealer_cards = [deck.pop(), deck.pop()]
-        game = {
+        shoe = get_shoe()
+        shoe.start_round()
+        return {
+            'id': uuid.uuid4().hex,
             'player': player_id,
             'bet': bet,
-            'deck': deck,
-            'player_cards': player_cards,
-            'dealer_cards': dealer_cards,
+            'player_hand': Hand([shoe.draw(), shoe.draw()]),
+            'dealer_hand': Hand([shoe.draw(), shoe.draw()]),
             'finished': False,
             'result': None,
+            'channel_id': None,
+            'message_id': None,
         }
 
-        def render():
-            def fmt(cards, hide_second=False):
-                out = []
-                for i, c in enumerate(cards):
-                    rank, suit = c.split('|', 1)
-                    if hide_second and i == 1:
-                        out.append('??')
-                    else:
-                        out.append(f"{rank}{suit}")
-                return ' '.join(out)
-
-            pc = fmt(game['player_cards'])
-            dc = fmt(game['dealer_cards'], hide_second=True)
-            score = score_hand(game['player_cards'])
-            embed = discord.Embed(title="Blackjack", color=discord.Color.green())
-            embed.add_field(name="Your Hand", value=f"{pc}\nScore: {score}", inline=False)
-            embed.add_field(name="Dealer", value=dc, inline=False)
-            embed.set_footer(text=f"Bet: {game['bet']}")
-            return embed
-
-        async def finish():
-            # dealer plays
-            game['finished'] = True
-            # reveal dealer
-            while score_hand(game['dealer_cards']) < 17:
-                game['dealer_cards'].append(game['deck'].pop())
-            pscore = score_hand(game['player_cards'])
-            dscore = score_hand(game['dealer_cards'])
-            # determine outcome
+    async def save_game(self, game):
+        # a hand settled while the caller was awaiting must not be written back
+        if game['finished']:
+            return
+        # plain card ints only, hands are rebuilt from them on restore
+        state = {
+            'player_cards': game['player_hand'].cards,
+            'dealer_cards': game['dealer_hand'].cards,
+        }
+        await self.sessions.save_async(
+            SESSION_KIND, game['id'], game['player'], state, SESSION_TTL,
+            bet=game['bet'], channel_id=game['channel_id'], message_id=game['message_id'],
+        )
+
+    async def restore_games(self):
+        # hands that were mid-play when the bot went down pick up where they left off
+        for session in await self.sessions.load_async(SESSION_KIND):
+            player_id = session['owner_id']
+            if not session['message_id']:
+                # the bot went down before the hand was ever shown, there is nothing to click
+                await self.sessions.delete_async(SESSION_KIND, session['session_id'])
+                self.economy.update_balance(player_id, session['bet'])
+                print(f"Refunded unsent blackjack bet of {session['bet']} to {player_id}")
+                continue
+            self.active_games[player_id] = {
+                'id': session['session_id'],
+                'player': player_id,
+                'bet': session['bet'],
+                'player_hand': Hand(session['state']['player_cards']),
+                'dealer_hand': Hand(session['state']['dealer_cards']),
+                'finished': False,
+                'result': None,
+                'channel_id': session['channel_id'],
+                'message_id': session['message_id'],
+            }
+            # persistent views can't time out, the sweeper refunds them if they're abandoned
+            view = BlackjackView(self, player_id, session['session_id'], timeout=None)
+            self.bot.add_view(view, message_id=session['message_id'])
+
+    @tasks.loop(minutes=1)
+    async def sweep_sessions(self):
+        for session in await self.sessions.pop_expired_async(SESSION_KIND):
+            player_id = session['owner_id']
+            game = self.active_games.get(player_id)
+            if game and game['id'] == session['session_id']:
+                if game['finished']:
+                    continue
+                self.active_games.pop(player_id, None)
+            # bet was taken up front, abandoned hands get it back
+            self.economy.update_balance(player_id, session['bet'])
+            print(f"Refunded abandoned blackjack bet of {session['bet']} to {player_id}")
+            channel = self.bot.get_channel(session['channel_id']) if session['channel_id'] else None
+            if channel and session['message_id']:
+                try:
+                    await channel.get_partial_message(session['message_id']).edit(
+                        content="Hand expired, your bet was refunded.", view=None
+                    )
+                except discord.HTTPException:
+                    pass
+
+    @sweep_sessions.before_loop
+    async def before_sweep(self):
+        await self.bot.wait_until_ready()
+
+    def render(self, game):
+        if game['finished']:
+            return self.final_render(game)
+        pc = game['player_hand'].labels()
+        dc = game['dealer_hand'].labels(hide_second=True)
+        score = game['player_hand'].score
+        embed = discord.Embed(title="Blackjack", color=discord.Color.green())
+        embed.add_field(name="Your Hand", value=f"{pc}\nScore: {score}", inline=False)
+        embed.add_field(name="Dealer", value=dc, inline=False)
+        embed.set_footer(text=f"Bet: {game['bet']}")
+        return embed
+
+    def final_render(self, game):
+        player, dealer = game['player_hand'], game['dealer_hand']
+        embed = discord.Embed(title="Blackjack - Result", color=discord.Color.blue())
+        embed.add_field(name="Your Hand", value=f"{player.labels()}\nScore: {player.score}", inline=False)
+        embed.add_field(name="Dealer", value=f"{dealer.labels()}\nScore: {dealer.score}", inline=False)
+        embed.add_field(name="Result", value=game['result'].upper(), inline=False)
+        embed.set_footer(text=f"Bet: {game['bet']}")
+        return embed
+
+    async def finish(self, game):
+        if game['finished']:
+            return
+        # dealer plays
+        game['finished'] = True
+        player_id = game['player']
+        player, dealer = game['player_hand'], game['dealer_hand']
+        shoe = get_shoe()
+        # reveal dealer
+        while dealer.score < 17:
+            dealer.add(shoe.draw())
+        pscore = player.score
+        dscore = dealer.score
+        # determine outcome
+        payout = 0
+        if pscore > 21:
+            game['result'] = 'bust'
             payout = 0
-            if pscore > 21:
-                game['result'] = 'bust'
-                payout = 0
-            elif is_blackjack(game['player_cards']) and not is_blackjack(game['dealer_cards']):
-                game['result'] = 'blackjack'
-                payout = int(game['bet'] * 1.5)
-            elif dscore > 21 or pscore > dscore:
-                game['result'] = 'win'
-                payout = game['bet']
-            elif pscore == dscore:
-                game['result'] = 'push'
-                payout = 0
-            else:
-                game['result'] = 'lose'
-                payout = -game['bet']
-
-            # settle
-            if payout > 0:
-                self.economy.update_balance(player_id, payout + game['bet'])
-            elif payout == 0 and game['result'] == 'push':
-                # return bet
-                self.economy.update_balance(player_id, game['bet'])
-            else:
-                # lost, do nothing (bet already deducted)
-                pass
-            # replace render with final summary
-            def final_render():
-                pc = ' '.join([f"{r}{s}" for r,s in (c.split('|',1) for c in game['player_cards'])])
-                dc = ' '.join([f"{r}{s}" for r,s in (c.split('|',1) for c in game['dealer_cards'])])
-                embed = discord.Embed(title="Blackjack - Result", color=discord.Color.blue())
-                embed.add_field(name="Your Hand", value=f"{pc}\nScore: {pscore}", inline=False)
-                embed.add_field(name="Dealer", value=f"{dc}\nScore: {dscore}", inline=False)
-                embed.add_field(name="Result", value=game['result'].upper(), inline=False)
-                embed.set_footer(text=f"Bet: {game['bet']}")
-                return embed
-
-            game['render'] = final_render
-            # remove active game record
-            try:
-                del self.active_games[player_id]
-            except KeyError:
-                pass
-
-        game['render'] = render
-        game['finish_func'] = finish
-        return game
+        elif player.blackjack and not dealer.blackjack:
+            game['result'] = 'blackjack'
+            payout = int(game['bet'] * 1.5)
+        elif dscore > 21 or pscore > dscore:
+            game['result'] = 'win'
+            payout = game['bet']
+        elif pscore == dscore:
+            game['result'] = 'push'
+            payout = 0
+        else:
+            game['result'] = 'lose'
+            payout = -game['bet']
+
+        # settle
+        if payout > 0:
+            self.economy.update_balance(player_id, payout + game['bet'])
+        elif payout == 0 and game['result'] == 'push':
+            # return bet
+            self.economy.update_balance(player_id, game['bet'])
+        else:
+            # lost, do nothing (bet already deducted)
+            pass
+        # settled, so there is nothing left to refund
+        await self.sessions.delete_async(SESSION_KIND, game['id'])
+        # remove active game record
+        if self.active_games.get(player_id) is game:
+            del self.active_games[player_id]
 
     @app_commands.command(name='blackjack', description='Play a quick blackjack round')
     @app_commands.describe(bet='Amount to wager')
@@ -176,9 +267,16 @@ class Blackjack(commands.Cog):
         self.economy.update_balance(interaction.user.id, -bet)
         game = self.create_game(interaction.user.id, bet)
         self.active_games[interaction.user.id] = game
-        view = BlackjackView(self.bot, game)
+        # escrow is recorded before anything can fail so a crash still refunds it
+        await self.save_game(game)
+        view = BlackjackView(self, interaction.user.id, game['id'])
 
-        await interaction.response.send_message(embed=game['render'](), view=view)
+        await interaction.response.send_message(embed=self.render(game), view=view)
+        message = await interaction.original_response()
+        view.message = message
+        game['channel_id'] = interaction.channel_id
+        game['message_id'] = message.id
+        await self.save_game(game)
         await set_cooldown(interaction)
 
 async def setup(bot):
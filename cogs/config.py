@@ -5,7 +5,12 @@ from discord import app_commands
 from discord.ext import commands, tasks
 import os, json, asyncio, random
 from utils.vote_manager import FILE_LOCK, generate_user_tierlist_text, SERVER_FILE, generate_tierlist_text, read_json, save_tierlist_reference, reset_votes, write_json, update_tierlist_message, load_votes
-from utils.bingo_manager import mark_flavor, render_board
+from utils.bingo_manager import mark_flavor
+from utils.render_manager import render_bingo_board
+from utils.corpus_manager import add_roast, AUTO_REACTS, FLAVOR_NAMES, FLAVOR_STATS
+from utils.role_index_manager import get_role_index
+import utils.duel_sim_manager as duel_sim
+from io import BytesIO
 
 class Config(commands.Cog):
     """
@@ -25,12 +30,7 @@ class Config(commands.Cog):
     @app_commands.command(name="addroast", description="Add a roast to the list!")
     async def addroast(self, interaction: discord.Interaction, roast: str):
         if(await admin_m.check_admin_status(self.bot, interaction)):
-            with open("data/roasts.json", "r+") as f:
-                data = json.load(f)
-                data["roasts"].append(roast)
-                f.seek(0)
-                json.dump(data, f, indent=4)
-                f.truncate()
+            await asyncio.to_thread(add_roast, roast)
             await interaction.response.send_message("Roast added!", ephemeral=True)
         else:
             await interaction.response.send_message("Sorry bro, you're not cool enough to use this. Ask a mod politely maybe?", ephemeral=True)
@@ -56,6 +56,7 @@ class Config(commands.Cog):
                 json.dump(data, f, indent=4)
                 f.truncate()
                 print("server_data auto reacts modified.")
+                AUTO_REACTS.invalidate()
                 await interaction.response.send_message(response, ephemeral=True)
         else:
             await interaction.response.send_message("Sorry bro, you're not cool enough to use this. Ask a mod politely maybe?", ephemeral=True)
@@ -219,8 +220,8 @@ class Config(commands.Cog):
         if interaction.guild_id:
             changed, board = await mark_flavor(interaction.guild_id, interaction.user.id, flavor)
             if changed and board:
-                buffer = await asyncio.to_thread(render_board, board)
-                file = discord.File(buffer, filename="dew_bingo.png")
+                png = await render_bingo_board(board)
+                file = discord.File(BytesIO(png), filename="dew_bingo.png")
                 content = f"{content}\n~~{flavor}~~ crossed off your bingo board!"
                 await interaction.response.send_message(content, file=file, ephemeral=True)
                 return
@@ -387,14 +388,65 @@ class Config(commands.Cog):
             f.seek(0)
             json.dump(data, f, indent=4)
             f.truncate()
+        # duel setup and the role leaderboard read from the cached corpora
+        FLAVOR_STATS.invalidate()
+        FLAVOR_NAMES.invalidate()
 
         print("server_data updated successfully.")
         await interaction.response.send_message("Duel stats added/updated for items in the list!", ephemeral=True)
 
+    @app_commands.command(name="rebalanceflavors", description="admin: simulate duels and even out flavor ATK/DEF toward a target spread")
+    @app_commands.describe(
+        target_spread="Largest allowed gap between the best and worst flavor's average score (0-1)",
+        strategy="How often simulated players attack",
+        apply="Save the new stats instead of only previewing them",
+    )
+    @app_commands.choices(
+        strategy=[app_commands.Choice(name=name, value=name) for name in sorted(duel_sim.STRATEGIES)]
+    )
+    async def rebalanceflavors(self, interaction: discord.Interaction, target_spread: app_commands.Range[float, 0.0, 1.0] = 0.1, strategy: str = "random", apply: bool = False):
+        if not await admin_m.check_admin_status(self.bot, interaction):
+            await interaction.response.send_message(
+                "Sorry bro, you're not cool enough to use this. Ask a mod politely maybe?",
+                ephemeral=True
+            )
+            return
+
+        flavors = duel_sim.load_guild_flavors(interaction.guild_id)
+        if len(flavors) < 2:
+            await interaction.response.send_message("Need at least two flavors with duel stats.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+        # numpy does the heavy lifting, keep it off the event loop anyway
+        names, matrix = await asyncio.to_thread(duel_sim.win_rate_matrix, flavors, 20_000, strategy)
+        before = duel_sim.field_scores(names, matrix)
+        # the preview matrix doubles as the rebalancer's starting point
+        stats, after, reached = await asyncio.to_thread(
+            duel_sim.rebalance, flavors, target_spread, 20_000, strategy, initial=(names, matrix)
+        )
+        if apply:
+            await asyncio.to_thread(duel_sim.save_guild_flavors, interaction.guild_id, stats)
+
+        lines = []
+        for name in sorted(stats, key=lambda key: -after[key]):
+            old, new = flavors[name], stats[name]
+            lines.append(
+                f"{name[:16]:<16} {before[name]:.2f} -> {after[name]:.2f}  "
+                f"atk {old['atk']}->{new['atk']} def {old['def']}->{new['def']}"
+            )
+        spread = max(after.values()) - min(after.values())
+        if reached:
+            header = f"Spread {spread:.2f}, within the {target_spread:.2f} target."
+        else:
+            header = f"Couldn't reach a {target_spread:.2f} spread, closest found is {spread:.2f}."
+        header += " Saved new duel stats:" if apply else " Preview only, run again with apply to save:"
+        await interaction.followup.send(f"{header}\n```\n" + "\n".join(lines)[:1800] + "\n```", ephemeral=True)
+
     
     @app_commands.command(name="mwr", description="Returns member count with role provided.")
     async def mwr(self, interaction: discord.Interaction, role: discord.Role):
-        count = sum(1 for member in interaction.guild.members if role in member.roles)
+        count = get_role_index().count(role)
         await interaction.response.send_message(f"{role.name} has {count} members.", ephemeral=True)
 
     @app_commands.command(name="addflavorstodb", description="Add flavors to database")
@@ -418,6 +470,8 @@ class Config(commands.Cog):
             f.seek(0)
             json.dump(data, f, indent=4)
             f.truncate()
+        FLAVOR_STATS.invalidate()
+        FLAVOR_NAMES.invalidate()
   
         await interaction.response.send_message("Added flavor(s)!")
     
@@ -1,4 +1,5 @@
 import asyncio
+from io import BytesIO
 
 import discord
 from discord import app_commands
@@ -8,7 +9,8 @@ from timezonefinder import TimezoneFinder
 
 from utils.dew_map_manager import add_flavors, remove_flavors, list_flavors, create_find, update_find_image, delete_find
 from utils.admin_manager import check_admin_status
-from utils.bingo_manager import mark_flavor, render_board
+from utils.bingo_manager import mark_flavor_for_guild
+from utils.render_manager import render_bingo_board
 from utils.text_filters import clean_text, contains_profanity
 
 
@@ -157,16 +159,41 @@ class DewMap(commands.Cog):
     async def maybe_update_bingo(self, interaction: discord.Interaction, flavor_name: str):
         if not interaction.guild_id:
             return
-        changed, board = await mark_flavor(interaction.guild_id, interaction.user.id, flavor_name)
-        if not changed or not board:
+        # a find counts as "spotted" for every board in the guild holding that flavor
+        changed, winners = await mark_flavor_for_guild(interaction.guild_id, flavor_name)
+        board = changed.get(str(interaction.user.id))
+        if board:
+            png = await render_bingo_board(board)
+            file = discord.File(BytesIO(png), filename="dew_bingo.png")
+            await interaction.followup.send(
+                content=f"~~{flavor_name}~~ crossed off your bingo board!",
+                file=file,
+                ephemeral=True,
+            )
+        if winners:
+            await self.announce_bingo_winners(interaction, flavor_name, winners)
+
+    async def announce_bingo_winners(self, interaction: discord.Interaction, flavor_name: str, winners):
+        channel = interaction.channel
+        if channel is None:
             return
-        buffer = await asyncio.to_thread(render_board, board)
-        file = discord.File(buffer, filename="dew_bingo.png")
-        await interaction.followup.send(
-            content=f"~~{flavor_name}~~ crossed off your bingo board!",
-            file=file,
-            ephemeral=True,
-        )
+        header = f"**BINGO!** {flavor_name} was spotted and completed a line for:"
+        mentions = [f"<@{user_id}>" for user_id in winners]
+        # keep each message under discord's 2000 character cap
+        chunk = header
+        for mention in mentions:
+            if len(chunk) + len(mention) + 1 > 1900:
+                await self._send_announcement(channel, chunk)
+                chunk = ""
+            chunk = f"{chunk} {mention}".strip()
+        if chunk:
+            await self._send_announcement(channel, chunk)
+
+    async def _send_announcement(self, channel, content: str):
+        try:
+            await channel.send(content, allowed_mentions=discord.AllowedMentions(users=True, roles=False, everyone=False))
+        except discord.HTTPException:
+            pass
 
 
 async def setup(bot):
@@ -1,13 +1,20 @@
 # cogs/duel.py
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord.ui import View, Button
-import asyncio, random, os, json
+import asyncio, random, time, heapq
 from typing import Optional
 
+from utils.corpus_manager import get_flavor_stats
+from utils.session_manager import get_session_store
+
 MAX_HP = 30
-DATA_FILE = "data/server_data.json"
+ROUND_TIMEOUT = 60  # seconds a player has to pick before forfeiting
+EDIT_COALESCE = 0.4  # seconds arena edits are held so bursts collapse into one
+SESSION_KIND = "duel"
+# pushed forward on every move, well past the round timeout so only orphans expire
+SESSION_TTL = ROUND_TIMEOUT * 5
 
 # Duel logic helpers
 def resolve_round(p1_move, p2_move, p1_atk, p1_def, p2_atk, p2_def):
@@ -38,6 +45,115 @@ def resolve_round(p1_move, p2_move, p1_atk, p1_def, p2_atk, p2_def):
 
     return p1_damage, p2_damage, p1_bonus, p2_bonus
 
+class DuelState:
+    """Everything about one running duel, attribute access instead of string keys."""
+
+    # fields that survive a restart, the rest is rebuilt from them
+    PERSISTED = (
+        "duel_id", "channel_id", "message_id", "round",
+        "p1_id", "p2_id", "p1_name", "p2_name", "p1_flavor", "p2_flavor",
+        "p1_atk", "p1_def", "p2_atk", "p2_def", "p1_hp", "p2_hp",
+        "p1_move", "p2_move", "p1_temp_def", "p2_temp_def", "last_round",
+    )
+    __slots__ = PERSISTED + ("message", "view", "rendered", "pending", "edit_task")
+
+    def __init__(self, duel_id, channel_id, challenger, target, p1_flavor, p2_flavor, chall_stats, targ_stats):
+        self.duel_id = duel_id
+        self.channel_id = channel_id
+        self.message_id = None
+        self.round = 1
+        self.p1_id = challenger.id
+        self.p2_id = target.id
+        self.p1_name = challenger.display_name
+        self.p2_name = target.display_name
+        self.p1_flavor = p1_flavor
+        self.p2_flavor = p2_flavor
+        self.p1_atk = chall_stats["atk"]
+        self.p1_def = chall_stats["def"]
+        self.p2_atk = targ_stats["atk"]
+        self.p2_def = targ_stats["def"]
+        self.p1_hp = MAX_HP
+        self.p2_hp = MAX_HP
+        self.p1_move = None
+        self.p2_move = None
+        self.p1_temp_def = 0
+        self.p2_temp_def = 0
+        # arena message handle from the initial send, edited without refetching
+        self.message = None
+        self.view = None
+        self.last_round = None
+        # (description, footer) last sent and the one waiting in the edit window
+        self.rendered = None
+        self.pending = None
+        self.edit_task = None
+
+    @property
+    def both_moved(self):
+        return self.p1_move is not None and self.p2_move is not None
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.PERSISTED}
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        state = cls.__new__(cls)
+        for name in cls.PERSISTED:
+            setattr(state, name, data.get(name))
+        state.message = None
+        state.view = None
+        state.rendered = None
+        state.pending = None
+        state.edit_task = None
+        return state
+
+
+class ForfeitTimers:
+    """One task handles every duel's round timeout.
+
+    Deadlines sit in a heap keyed by (deadline, duel id, round); a stale entry
+    (duel gone or round already resolved) is simply skipped when it fires, so
+    nothing ever has to be cancelled.
+    """
+
+    def __init__(self, on_expire):
+        self.on_expire = on_expire
+        self._heap = []
+        self._wake = asyncio.Event()
+        self._task = None
+
+    def schedule(self, duel_id, round_no, delay=ROUND_TIMEOUT):
+        deadline = time.monotonic() + delay
+        heapq.heappush(self._heap, (deadline, duel_id, round_no))
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        self._wake.set()
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            if not self._heap:
+                self._wake.clear()
+                await self._wake.wait()
+                continue
+            delay = self._heap[0][0] - time.monotonic()
+            if delay > 0:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            _, duel_id, round_no = heapq.heappop(self._heap)
+            try:
+                await self.on_expire(duel_id, round_no)
+            except Exception as e:
+                print(f"duel timeout handling failed for {duel_id}: {e}")
+
+
 # UI Views
 class AcceptView(View):
     def __init__(self, challenger_id, target_id):
@@ -73,10 +189,13 @@ class DuelView(View):
         super().__init__(timeout=None)
         self.cog = cog
         self.duel_id = duel_id
+        # stable custom ids let the view be re-registered after a restart
+        self.attack.custom_id = f"duel:{duel_id}:atk"
+        self.defend.custom_id = f"duel:{duel_id}:def"
 
     async def interaction_check(self, interaction: discord.Interaction) :
         duel = self.cog.active_duels.get(self.duel_id)
-        return duel and interaction.user.id in (duel["p1_id"], duel["p2_id"])
+        return duel and interaction.user.id in (duel.p1_id, duel.p2_id)
 
     @discord.ui.button(label="Attack", style=discord.ButtonStyle.primary)
     async def attack(self, interaction: discord.Interaction, button: Button):
@@ -92,31 +211,86 @@ class DuelView(View):
 class Duel(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.active_duels = {}  # duel_id 
-        self.flavors = {}       # guild_id : stats}
-
-    def load_flavors(self, guild_id: int):
-        self.flavors = {}
-        if os.path.exists(DATA_FILE):
-            try:
-                with open(DATA_FILE, "r") as f:
-                    data = json.load(f)
-                    self.flavors = data.get(str(guild_id), {}).get("flavor_roles", {})
-            except Exception as e:
-                print("Error loading server_data.json:", e)
+        self.active_duels = {}  # duel_id -> DuelState
+        # guild id -> (flavor stats it was built from, {role id: (flavor, stats)})
+        self._flavor_index = {}
+        self.timers = ForfeitTimers(self.on_round_timeout)
+        self.sessions = get_session_store()
+
+    async def cog_load(self):
+        await self.restore_duels()
+        self.sweep_sessions.start()
+
+    async def cog_unload(self):
+        self.timers.stop()
+        self.sweep_sessions.cancel()
+
+    async def save_duel(self, state: DuelState):
+        # a duel ended while the caller was awaiting must not be written back
+        if self.active_duels.get(state.duel_id) is not state:
+            return
+        await self.sessions.save_async(
+            SESSION_KIND, state.duel_id, state.p1_id, state.to_dict(), SESSION_TTL,
+            channel_id=state.channel_id, message_id=state.message_id,
+        )
 
-    def user_flavor_role(self, member: discord.Member, flavor_keys):
+    async def restore_duels(self):
+        # duels running when the bot went down get their buttons back and a fresh round timer
+        for session in await self.sessions.load_async(SESSION_KIND):
+            state = DuelState.from_dict(session["state"])
+            if not state.message_id:
+                continue
+            self.active_duels[state.duel_id] = state
+            state.view = DuelView(self, state.duel_id)
+            self.bot.add_view(state.view, message_id=state.message_id)
+            self.timers.schedule(state.duel_id, state.round)
+
+    @tasks.loop(minutes=5)
+    async def sweep_sessions(self):
+        # round timers end live duels, this clears anything they never got to
+        for session in await self.sessions.pop_expired_async(SESSION_KIND):
+            self.active_duels.pop(session["session_id"], None)
+
+    def flavor_index(self, guild: discord.Guild):
+        """role id -> (flavor name, duel stats) for the guild, rebuilt only when stats or roles change."""
+        stats = get_flavor_stats(guild.id)
+        cached = self._flavor_index.get(guild.id)
+        if cached and cached[0] is stats:
+            return cached[1]
+        index = {}
+        for role in guild.roles:
+            flavor = stats.get(role.name.strip().lower())
+            if flavor:
+                index[role.id] = flavor
+        self._flavor_index[guild.id] = (stats, index)
+        return index
+
+    def user_flavor_role(self, member: discord.Member, index):
         for role in member.roles:
-            if role.name.lower() in (k.lower() for k in flavor_keys):
-                return role.name
+            flavor = index.get(role.id)
+            if flavor:
+                return flavor
         return None
 
-    def duel_status_text(self, state):
-        return (f"Round: {state['round']}\n\n"
-                f"**{state['p1_name']}** ({state['p1_flavor']}) — HP: {state['p1_hp']}\n"
-                f"ATK {state['p1_atk']} / DEF {state['p1_def'] + state['p1_temp_def']}\n\n"
-                f"**{state['p2_name']}** ({state['p2_flavor']}) — HP: {state['p2_hp']}\n"
-                f"ATK {state['p2_atk']} / DEF {state['p2_def'] + state['p2_temp_def']}\n\n"
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role: discord.Role):
+        self._flavor_index.pop(role.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        if before.name != after.name:
+            self._flavor_index.pop(after.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        self._flavor_index.pop(role.guild.id, None)
+
+    def duel_status_text(self, state: DuelState):
+        return (f"Round: {state.round}\n\n"
+                f"**{state.p1_name}** ({state.p1_flavor}) — HP: {state.p1_hp}\n"
+                f"ATK {state.p1_atk} / DEF {state.p1_def + state.p1_temp_def}\n\n"
+                f"**{state.p2_name}** ({state.p2_flavor}) — HP: {state.p2_hp}\n"
+                f"ATK {state.p2_atk} / DEF {state.p2_def + state.p2_temp_def}\n\n"
                 "Both players choose attack or defend using the buttons below (choices hidden).")
 
         # Slash command
@@ -128,25 +302,24 @@ class Duel(commands.Cog):
             await interaction.response.send_message("This command can only be used in a server.", ephemeral=True)
             return
 
-        self.load_flavors(guild.id)
-        if not self.flavors:
+        if not get_flavor_stats(guild.id):
             await interaction.response.send_message("No duel items configured for this server.", ephemeral=True)
             return
+        flavors = self.flavor_index(guild)
 
         challenger = interaction.user
         if challenger.id == target.id:
             await interaction.response.send_message("You can't duel yourself.", ephemeral=True)
             return
 
-        flavor_keys = set(self.flavors.keys())
-        chall_flavor = self.user_flavor_role(challenger, flavor_keys)
-        targ_flavor = self.user_flavor_role(target, flavor_keys)
-        if not chall_flavor or not targ_flavor:
+        chall_role = self.user_flavor_role(challenger, flavors)
+        targ_role = self.user_flavor_role(target, flavors)
+        if not chall_role or not targ_role:
             await interaction.response.send_message("Both players need a flavor role.", ephemeral=True)
             return
 
-        chall_stats = self.flavors[chall_flavor]["duel_stats"]
-        targ_stats = self.flavors[targ_flavor]["duel_stats"]
+        chall_flavor, chall_stats = chall_role
+        targ_flavor, targ_stats = targ_role
 
         embed = discord.Embed(
             title=f"{challenger.display_name} challenges {target.display_name}!",
@@ -160,11 +333,11 @@ class Duel(commands.Cog):
         view.message = await interaction.original_response()
 
         asyncio.create_task(
-            self.handle_duel_accept(view, challenger, target, chall_stats, targ_stats, interaction.channel)
+            self.handle_duel_accept(view, challenger, target, chall_role, targ_role, interaction.channel)
         )
 
         # Duel lifecycle
-    async def handle_duel_accept(self, view, challenger, target, chall_stats, targ_stats, channel):
+    async def handle_duel_accept(self, view, challenger, target, chall_role, targ_role, channel):
         try:
             await asyncio.wait_for(view.accepted.wait(), timeout=60)
         except asyncio.TimeoutError:
@@ -172,165 +345,185 @@ class Duel(commands.Cog):
             return
 
         duel_id = str(random.randint(10**8, 10**9 - 1))
-        state = {
-            "duel_id": duel_id,
-            "p1_id": challenger.id,
-            "p2_id": target.id,
-            "p1_name": challenger.display_name,
-            "p2_name": target.display_name,
-            "p1_flavor": self.user_flavor_role(challenger, set(self.flavors.keys())),
-            "p2_flavor": self.user_flavor_role(target, set(self.flavors.keys())),
-            "p1_atk": chall_stats["atk"],
-            "p1_def": chall_stats["def"],
-            "p2_atk": targ_stats["atk"],
-            "p2_def": targ_stats["def"],
-            "p1_hp": MAX_HP,
-            "p2_hp": MAX_HP,
-            "p1_move": None,
-            "p2_move": None,
-            "p1_temp_def": 0,
-            "p2_temp_def": 0,
-            "round": 1,
-            "message_id": None,
-            "channel_id": channel.id
-        }
+        state = DuelState(
+            duel_id,
+            channel.id,
+            challenger,
+            target,
+            chall_role[0],
+            targ_role[0],
+            chall_role[1],
+            targ_role[1],
+        )
         self.active_duels[duel_id] = state
 
-        arena_embed = discord.Embed(
-            title="Dew Duel — Arena",
-            description=self.duel_status_text(state),
-            color=0x00FF00
-        )
-        arena_view = DuelView(self, duel_id)
-        msg = await channel.send(embed=arena_embed, view=arena_view)
-        state["message_id"] = msg.id
+        render = self.arena_render(state)
+        state.view = DuelView(self, duel_id)
+        state.message = await channel.send(embed=self.arena_embed(render), view=state.view)
+        state.message_id = state.message.id
+        state.rendered = render
+        await self.save_duel(state)
+
+        # no watcher task per duel, the shared timer only wakes on a deadline
+        self.timers.schedule(duel_id, state.round)
 
-        asyncio.create_task(self.duel_watcher(duel_id))
+    async def _reply(self, interaction, content):
+        # the buttons already defer, so anything after that goes through followup
+        if interaction.response.is_done():
+            await interaction.followup.send(content, ephemeral=True)
+        else:
+            await interaction.response.send_message(content, ephemeral=True)
 
     async def player_choice(self, interaction, duel_id: str, choice: str):
         state = self.active_duels.get(duel_id)
         if not state:
-            await interaction.response.send_message("Duel not found.", ephemeral=True)
+            await self._reply(interaction, "Duel not found.")
             return
 
         uid = interaction.user.id
-        if uid == state["p1_id"]:
-            if state["p1_move"] is not None:
-                await interaction.response.send_message("You already chose this round.", ephemeral=True)
+        if uid == state.p1_id:
+            if state.p1_move is not None:
+                await self._reply(interaction, "You already chose this round.")
                 return
-            state["p1_move"] = choice
-        elif uid == state["p2_id"]:
-            if state["p2_move"] is not None:
-                await interaction.response.send_message("You already chose this round.", ephemeral=True)
+            state.p1_move = choice
+        elif uid == state.p2_id:
+            if state.p2_move is not None:
+                await self._reply(interaction, "You already chose this round.")
                 return
-            state["p2_move"] = choice
+            state.p2_move = choice
         else:
-            await interaction.response.send_message("You're not part of this duel.", ephemeral=True)
+            await self._reply(interaction, "You're not part of this duel.")
             return
 
-        await interaction.response.defer(ephemeral=True)
-        await self.update_duel_message(duel_id)
+        if not interaction.response.is_done():
+            await interaction.response.defer(ephemeral=True)
+        await self.save_duel(state)
 
-    async def wait_for_both_moves(self, duel_id):
-        while True:
-            state = self.active_duels.get(duel_id)
-            if not state:
-                return
-            if state["p1_move"] and state["p2_move"]:
-                return
-            await asyncio.sleep(0.3)
+        # the second choice of the round is the signal to resolve it
+        if state.both_moved:
+            await self.resolve_round(state)
+        else:
+            await self.update_duel_message(duel_id)
 
-    async def duel_watcher(self, duel_id):
-        while duel_id in self.active_duels:
-            state = self.active_duels.get(duel_id)
-            if not state:
-                return
-            try:
-                await asyncio.wait_for(self.wait_for_both_moves(duel_id), timeout=60)
-            except asyncio.TimeoutError:
-                if state["p1_move"] is None:
-                    await self.end_duel(duel_id, state["p2_id"], f"{state['p1_name']} did not choose (forfeit).")
-                    return
-                if state["p2_move"] is None:
-                    await self.end_duel(duel_id, state["p1_id"], f"{state['p2_name']} did not choose (forfeit).")
-                    return
-
-            p1_total_def = state["p1_def"] + state["p1_temp_def"]
-            p2_total_def = state["p2_def"] + state["p2_temp_def"]
-            p1_dmg, p2_dmg, p1_bonus, p2_bonus = resolve_round(
-                state["p1_move"], state["p2_move"],
-                state["p1_atk"], p1_total_def,
-                state["p2_atk"], p2_total_def
-            )
-
-            state["p1_hp"] -= p1_dmg
-            state["p2_hp"] -= p2_dmg
-            state["p1_temp_def"] = p1_bonus
-            state["p2_temp_def"] = p2_bonus
-            state["round"] += 1
-
-            await self.update_duel_message(duel_id, after_resolve=True, last_moves=(state["p1_move"], state["p2_move"], p1_dmg, p2_dmg))
-            state["p1_move"] = state["p2_move"] = None
-
-            if state["p1_hp"] <= 0 and state["p2_hp"] <= 0:
-                await self.end_duel(duel_id, None, "Draw")
-                return
-            elif state["p1_hp"] <= 0:
-                await self.end_duel(duel_id, state["p2_id"], f"{state['p1_name']} fell to 0 HP.")
-                return
-            elif state["p2_hp"] <= 0:
-                await self.end_duel(duel_id, state["p1_id"], f"{state['p2_name']} fell to 0 HP.")
-                return
+    async def on_round_timeout(self, duel_id, round_no):
+        state = self.active_duels.get(duel_id)
+        # stale deadline: duel over or that round already resolved
+        if not state or state.round != round_no or state.both_moved:
+            return
+        if state.p1_move is None:
+            await self.end_duel(duel_id, state.p2_id, f"{state.p1_name} did not choose (forfeit).")
+        else:
+            await self.end_duel(duel_id, state.p1_id, f"{state.p2_name} did not choose (forfeit).")
+
+    async def resolve_round(self, state: DuelState):
+        # no awaits until the moves are cleared, so a round can only resolve once
+        p1_move, p2_move = state.p1_move, state.p2_move
+        p1_total_def = state.p1_def + state.p1_temp_def
+        p2_total_def = state.p2_def + state.p2_temp_def
+        p1_dmg, p2_dmg, p1_bonus, p2_bonus = resolve_round(
+            p1_move, p2_move,
+            state.p1_atk, p1_total_def,
+            state.p2_atk, p2_total_def
+        )
 
-            await asyncio.sleep(0.5)
+        state.p1_hp -= p1_dmg
+        state.p2_hp -= p2_dmg
+        state.p1_temp_def = p1_bonus
+        state.p2_temp_def = p2_bonus
+        state.round += 1
+        state.p1_move = state.p2_move = None
 
-    async def update_duel_message(self, duel_id, after_resolve=False, last_moves=None):
-        state = self.active_duels.get(duel_id)
-        if not state: return
-        channel = self.bot.get_channel(state["channel_id"])
-        if not channel: return
-        try:
-            msg = await channel.fetch_message(state["message_id"])
-        except Exception:
+        if state.p1_hp <= 0 and state.p2_hp <= 0:
+            await self.end_duel(state.duel_id, None, "Draw")
+            return
+        elif state.p1_hp <= 0:
+            await self.end_duel(state.duel_id, state.p2_id, f"{state.p1_name} fell to 0 HP.")
+            return
+        elif state.p2_hp <= 0:
+            await self.end_duel(state.duel_id, state.p1_id, f"{state.p2_name} fell to 0 HP.")
             return
 
+        line = f"Last round: {state.p1_name} chose **{p1_move}**, {state.p2_name} chose **{p2_move}**. "
+        if p1_dmg: line += f"{state.p1_name} took {p1_dmg} dmg. "
+        if p2_dmg: line += f"{state.p2_name} took {p2_dmg} dmg. "
+        state.last_round = line
+
+        await self.save_duel(state)
+        self.timers.schedule(state.duel_id, state.round)
+        await self.update_duel_message(state.duel_id)
+
+    def arena_render(self, state: DuelState):
         desc = self.duel_status_text(state)
-        if after_resolve and last_moves:
-            p1_move, p2_move, p1_dmg, p2_dmg = last_moves
-            line = f"Last round: {state['p1_name']} chose **{p1_move}**, {state['p2_name']} chose **{p2_move}**. "
-            if p1_dmg: line += f"{state['p1_name']} took {p1_dmg} dmg. "
-            if p2_dmg: line += f"{state['p2_name']} took {p2_dmg} dmg. "
-            desc = line + "\n\n" + desc
+        if state.last_round:
+            desc = state.last_round + "\n\n" + desc
+        return desc, f"Round {state.round} — waiting for both choices"
 
+    def arena_embed(self, render):
+        desc, footer = render
         embed = discord.Embed(title="Dew Duel — Arena", description=desc, color=0x00FF00)
-        embed.set_footer(text=f"Round {state['round']} — waiting for both choices")
-        await msg.edit(embed=embed, view=DuelView(self, duel_id))
+        embed.set_footer(text=footer)
+        return embed
 
-    async def end_duel(self, duel_id, winner_id: Optional[int], reason=""):
+    async def update_duel_message(self, duel_id):
         state = self.active_duels.get(duel_id)
+        if not state: return
+        state.pending = self.arena_render(state)
+        if state.edit_task is None or state.edit_task.done():
+            state.edit_task = asyncio.create_task(self._flush_duel_edit(state))
+
+    async def _flush_duel_edit(self, state: DuelState):
+        # whatever is pending when the window closes is the only edit sent,
+        # anything that lands during the edit itself gets its own window after
+        while state.pending is not None:
+            await asyncio.sleep(EDIT_COALESCE)
+            render, state.pending = state.pending, None
+            # choices are hidden, so a click alone usually renders the same embed
+            if render is None or render == state.rendered:
+                continue
+            if self.active_duels.get(state.duel_id) is not state:
+                return
+            msg = self._arena_message(state)
+            if msg is None:
+                return
+            try:
+                await msg.edit(embed=self.arena_embed(render), view=state.view)
+            except discord.HTTPException as e:
+                print(f"Failed to edit duel {state.duel_id}: {e}")
+                continue
+            state.rendered = render
+
+    def _arena_message(self, state: DuelState):
+        if state.message is None:
+            channel = self.bot.get_channel(state.channel_id)
+            if channel:
+                state.message = channel.get_partial_message(state.message_id)
+        return state.message
+
+    async def end_duel(self, duel_id, winner_id: Optional[int], reason=""):
+        # pop first so a late click or timer can't end the same duel twice
+        state = self.active_duels.pop(duel_id, None)
         if not state:
             return
-        channel = self.bot.get_channel(state["channel_id"])
-        msg = None
-        if channel:
-            try:
-                msg = await channel.fetch_message(state["message_id"])
-            except Exception:
-                pass
+        await self.sessions.delete_async(SESSION_KIND, duel_id)
+        if state.edit_task and not state.edit_task.done():
+            # the final embed replaces anything still waiting in the window
+            state.edit_task.cancel()
+        msg = self._arena_message(state)
 
         if winner_id is None:
             title = "Dew Duel — Draw"
             desc = f"Result: Draw. {reason}"
         else:
-            winner_name = state["p1_name"] if winner_id == state["p1_id"] else state["p2_name"]
+            winner_name = state.p1_name if winner_id == state.p1_id else state.p2_name
             title = "Dew Duel — Finished"
             desc = f"Winner: {winner_name}. {reason}"
 
         if msg:
             embed = discord.Embed(title=title, description=desc, color=0x00FF00)
-            await msg.edit(embed=embed, view=None)
-
-        self.active_duels.pop(duel_id, None)
+            try:
+                await msg.edit(embed=embed, view=None)
+            except discord.HTTPException as e:
+                print(f"Failed to close duel {duel_id}: {e}")
     
     @app_commands.command(name="duelrules", description="Learn how Dew Duel works and see flavor stats")
     async def duelrules(self, interaction: discord.Interaction):
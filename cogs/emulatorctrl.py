@@ -1,19 +1,7 @@
-import discord, asyncio, json
+import discord
 from discord import app_commands
 from discord.ext import commands
-from utils.emulator_manager import EmulatorController, send_press_remote, send_press_sequence_remote
-
-USER_DATA_LOCK = asyncio.Lock()
-
-async def read_user_data():
-    async with USER_DATA_LOCK:
-        # read JSON safely in thread
-        return await asyncio.to_thread(lambda: json.load(open("data/user_data.json", "r")))
-
-async def write_user_data(data):
-    async with USER_DATA_LOCK:
-        await asyncio.to_thread(lambda: json.dump(data, open("data/user_data.json", "w"), indent=4))
-
+from utils.emulator_manager import EmulatorController, get_press_counter, send_press_remote, send_press_sequence_remote
 
 
 class EmulatorCtrl(commands.Cog):
@@ -50,11 +38,13 @@ class EmulatorCtrl(commands.Cog):
                 return
 
         await interaction.response.defer(ephemeral=True)
-        # send the button presses
-        send_press_sequence_remote(buttons)
+        # queue the button presses, the relay paces them to the emulator
+        if not send_press_sequence_remote(buttons):
+            await interaction.followup.send("The emulator is busy, try again in a moment.", ephemeral=True)
+            return
 
         await interaction.followup.send(
-            f"Sent button sequence: {' '.join(buttons)}",
+            f"Queued button sequence: {' '.join(buttons)}",
             ephemeral=True
         )
     # leaderboard command
@@ -63,41 +53,20 @@ class EmulatorCtrl(commands.Cog):
         description="Show who has the most button presses!"
     )
     async def leaderboard(self, interaction: discord.Interaction):
-        raw = await read_user_data()
-        guild_id = str(interaction.guild.id)
-
-        if guild_id not in raw:
-            await interaction.response.send_message(
-                "No data found for this server.",
-                ephemeral=True
-            )
-            return
-
-        data = raw[guild_id]
-        leaderboard = []
+        top = await get_press_counter().top(interaction.guild.id)
 
-        # build cache of members
-        members = {str(member.id): member.display_name for member in interaction.guild.members}
-
-        for user_id, user_data in data.items():
-            count = user_data.get("button_pressed_count", 0)
-            if count > 0:
-                name = members.get(user_id, f"<User {user_id}>")
-                leaderboard.append((name, count))
-
-        if not leaderboard:
+        if not top:
             await interaction.response.send_message(
                 "No button presses recorded yet.",
                 ephemeral=True
             )
             return
 
-        # sort descending
-        leaderboard.sort(key=lambda x: x[1], reverse=True)
-
-        # build message
+        # only the ten names on the board are looked up
         msg = "**Button Press Leaderboard:**\n"
-        for idx, (username, count) in enumerate(leaderboard[:10], start=1):
+        for idx, (user_id, count) in enumerate(top, start=1):
+            member = interaction.guild.get_member(int(user_id))
+            username = member.display_name if member else f"<User {user_id}>"
             msg += f"{idx}. **{username}** — {count} presses\n"
 
         await interaction.response.send_message(msg, ephemeral=True)
@@ -4,12 +4,13 @@ Slash commands for games
 
 import discord
 from discord import app_commands, SelectOption
-from discord.ext import commands
-from discord.ui import View, Select
+from discord.ext import commands, tasks
+from discord.ui import View, Select, Button
 import random, asyncio, json, os
-from datetime import datetime, timedelta, timezone
 from utils.booster_manager import check_boost_status
-from utils.quote_manager import load_quotes
+from utils.quote_manager import get_quote_store, PAGE_SIZE
+from utils.activity_manager import ActivityTracker
+from utils.corpus_manager import get_roasts
 from utils.vote_manager import load_votes, update_tierlist_message, get_votes_from_user_data
 from utils.cooldown_manager import *
 
@@ -21,19 +22,56 @@ class Games(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.cooldowns = {}
+        self.activity = ActivityTracker()
+        self.backfill_task = None
+
+    async def cog_load(self):
+        self.flush_activity.start()
+        # kept so the task isn't garbage collected mid-backfill and can be cancelled on unload
+        self.backfill_task = asyncio.create_task(self.backfill_activity())
+
+    async def cog_unload(self):
+        self.flush_activity.cancel()
+        if self.backfill_task and not self.backfill_task.done():
+            self.backfill_task.cancel()
+        await self.activity.flush()
+
+    async def backfill_activity(self):
+        await self.bot.wait_until_ready()
+        try:
+            await self.fill_quote_authors()
+        except Exception as e:
+            print(f"quote author backfill failed: {e}")
+        try:
+            await self.activity.backfill(self.bot.guilds)
+        except Exception as e:
+            print(f"activity backfill failed: {e}")
+
+    async def fill_quote_authors(self):
+        # quotes imported from user_data.json only have ids, search and autocomplete want names
+        store = get_quote_store()
+        for guild in self.bot.guilds:
+            names = {}
+            for author_id in await asyncio.to_thread(store.missing_author_ids, guild.id):
+                member = guild.get_member(int(author_id)) if author_id.isdigit() else None
+                if member:
+                    names[author_id] = member.display_name
+            if names:
+                await asyncio.to_thread(store.fill_author_names, guild.id, names)
+
+    @tasks.loop(minutes=5)
+    async def flush_activity(self):
+        await self.activity.flush()
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        if message.guild is None:
+            return
+        self.activity.record(message)
 
     async def get_msg_count_roast(self, interaction: discord.Interaction, user: discord.Member, roasts: dict) :
-        total_msgs = 0
-        user_msgs = 0
-        print(f"Fetching up to 5000 messages in #{interaction.channel.name}...")
-
-        time_limit = datetime.now(timezone.utc) - timedelta(days=7)
-
-        # Fetch messages in chunks to avoid API rate limits
-        async for msg in interaction.channel.history(limit=5000, after=time_limit):
-            total_msgs += 1
-            if msg.author.id == user.id:
-                user_msgs += 1
+        # counts come from the rolling activity tracker instead of a history scan
+        user_msgs, total_msgs = self.activity.counts(interaction.channel_id, user.id)
 
         percent = round((user_msgs / total_msgs) * 100, 2) if total_msgs else 0
 
@@ -127,9 +165,8 @@ class Games(commands.Cog):
         # defer the response for long-running operations
         await interaction.response.defer(ephemeral=False)
 
-        # load roast data
-        with open("data/roasts.json", "r") as f:
-            roast_dict = json.load(f)
+        # roast data comes from the in-memory corpus, no file read per call
+        roast_dict = get_roasts()
         roasts = roast_dict["roasts"]
 
         # decide if we do the message-count-based roast (~7.5% chance)
@@ -137,8 +174,7 @@ class Games(commands.Cog):
             message = await self.get_msg_count_roast(interaction, user, roast_dict)
         else:
             # Random generic roast
-            random_roast_num = random.randint(0, len(roasts) - 1)
-            message = f"{user.mention} {roasts[random_roast_num]}"
+            message = f"{user.mention} {random.choice(roasts)}"
 
         # Send the followup after defer
         await interaction.followup.send(message[:2000])
@@ -156,61 +192,81 @@ class Games(commands.Cog):
             if await check_cooldown(interaction, COOLDOWN_TIME):
                 time_left = await get_remaining_cooldown(interaction, COOLDOWN_TIME)
                 await interaction.response.send_message(f"You're on cooldown! Try again in {time_left}.", ephemeral=True)
-        quote = {}
-        data = await load_quotes()  # load all saved quotes
-        if not data:
+                return
+        store = get_quote_store()
+        guild_id = interaction.guild_id
+        saver_id = interaction.user.id
+        if not await asyncio.to_thread(store.count, guild_id, saver_id):
             # no quotes found, tell user how to save one
             await interaction.response.send_message("No quotes available. Try saving some by selecting a message, going to Apps, and then 'Save Quote!'")
             return
-        randomized = False
-        recall_data = data[str(interaction.guild_id)][str(interaction.user.id)]["recalls"]
         # if user isn't valid or didn't specify a user, just pick a random quote from their own recalls
         if(not is_valid_user or user is None):
-            quote = random.choice(recall_data)
-            randomized = True
-        if(randomized == False):
-            # user is valid and specified a user, so let them pick from a list of that user's quotes
-            print("Selected quote...")
-            filtered_recall = [q for q in recall_data if str(q.get("msg_author_id")) == str(user.id)]
-            options = []
-            for q in filtered_recall[:25]:  # discord only allows 25 options in a select
-                author = interaction.guild.get_member(int(q["msg_author_id"]))
-                author_name = author.display_name if author else "Unknown"
-                label = f'{author_name}: {q["content"][:50]}'  # show author and first 50 chars of quote
-                options.append(SelectOption(label=label, value=q["message_id"]))
-
-            # create select menu for user to pick a quote
-            select = Select(placeholder="Pick a quote...", options=options, min_values=1, max_values=1)
-
-            # callback for when user picks a quote
-            async def select_callback(select_interaction: discord.Interaction):
-                selected_id = select.values[0]
-                selected_quote = next(q for q in filtered_recall if q["message_id"] == str(selected_id))
-                author_id = selected_quote["msg_author_id"]
-                author = await self.get_display_name(interaction.guild, author_id)
-                response = f'"{selected_quote["content"]}" — {author}'
-                if ping:
-                    response = f'"{selected_quote["content"]}" — <@{author_id}>'
-                await select_interaction.response.send_message(response)
-
-            select.callback = select_callback  # set the callback for the select menu
-            view = View()
-            view.add_item(select)  # add select to the view
-            await interaction.response.send_message("Choose a quote:", view=view, ephemeral=True)
-        else:
-            # just send a random quote (either not a booster or no user specified)
             print("Randomized quote...")
+            quote = await asyncio.to_thread(store.random_quote, guild_id, saver_id)
             author_id = quote["msg_author_id"]
-            author = await self.get_display_name(interaction.guild, author_id)
-            print(author)
+            author = await self.get_display_name(interaction.guild, int(author_id))
             if ping:
                 await interaction.response.send_message(f'"{quote["content"]}" — <@{author_id}>')
-                if not is_valid_user:
-                    await set_cooldown(interaction)
-                    return
-            await interaction.response.send_message(f'"{quote["content"]}" — {author}')
+            else:
+                await interaction.response.send_message(f'"{quote["content"]}" — {author}')
             if not is_valid_user:
-                await set_cooldown(interaction)  
+                await set_cooldown(interaction)
+            return
+
+        # user is valid and specified a user, so let them page through that user's quotes
+        print("Selected quote...")
+        total = await asyncio.to_thread(store.count, guild_id, saver_id, user.id)
+        if not total:
+            await interaction.response.send_message(f"You haven't saved any quotes from {user.display_name} yet.", ephemeral=True)
+            return
+        view = RecallPickerView(self, interaction, user, ping, total)
+        await view.load_page()
+        await interaction.response.send_message(view.page_label(), view=view, ephemeral=True)
+
+    @app_commands.command(name="recallsearch", description="Search saved quotes in this server by text or author")
+    @app_commands.describe(quote="Start typing to search saved quotes")
+    async def recallsearch(self, interaction: discord.Interaction, quote: str, ping: bool = False):
+        COOLDOWN_TIME = 600 # same cooldown as /recall for non-boosters
+        is_valid_user = await check_boost_status(self.bot, interaction)
+        if not is_valid_user and await check_cooldown(interaction, COOLDOWN_TIME):
+            time_left = await get_remaining_cooldown(interaction, COOLDOWN_TIME)
+            await interaction.response.send_message(f"You're on cooldown! Try again in {time_left}.", ephemeral=True)
+            return
+        store = get_quote_store()
+        # autocomplete hands back the quote id, free text falls back to the best match
+        selected = await asyncio.to_thread(store.get, int(quote)) if quote.isdigit() else None
+        if selected is None or selected["guild_id"] != str(interaction.guild_id):
+            matches = await asyncio.to_thread(store.search, interaction.guild_id, quote, 1)
+            selected = matches[0] if matches else None
+        if selected is None:
+            await interaction.response.send_message("No saved quotes matched that search.", ephemeral=True)
+            return
+        author_id = selected["msg_author_id"]
+        if ping:
+            await interaction.response.send_message(f'"{selected["content"]}" — <@{author_id}>')
+        else:
+            author = await self.get_display_name(interaction.guild, int(author_id))
+            await interaction.response.send_message(f'"{selected["content"]}" — {author}')
+        if not is_valid_user:
+            await set_cooldown(interaction)
+
+    @recallsearch.autocomplete("quote")
+    async def recallsearch_autocomplete(self, interaction: discord.Interaction, current: str):
+        # runs on every keystroke, so this only ever hits the fts index
+        # discord drops autocomplete answers after 3s, a late one is worse than none
+        try:
+            results = await asyncio.wait_for(
+                asyncio.to_thread(get_quote_store().search, interaction.guild_id, current, 25), 2.0
+            )
+        except asyncio.TimeoutError:
+            return []
+        choices = []
+        for q in results:
+            author = q["author_name"] or f"User {q['msg_author_id']}"
+            label = f'{author}: {q["content"] or "[no content]"}'
+            choices.append(app_commands.Choice(name=label[:100], value=str(q["id"])))
+        return choices
 
     @app_commands.command(name="vote", description="Once a day, vote for a flavor on the tierlist!")
     async def vote(self, interaction: discord.Interaction, flavor: str, score: app_commands.Range[int, 1, 10]):
@@ -312,5 +368,67 @@ class Games(commands.Cog):
     
     
 
+class RecallPickerView(View):
+    """Select menu over one author's saved quotes with prev/next paging."""
+
+    def __init__(self, cog: Games, interaction: discord.Interaction, author: discord.Member, ping: bool, total: int):
+        super().__init__(timeout=180)
+        self.cog = cog
+        self.guild = interaction.guild
+        self.saver_id = interaction.user.id
+        self.author = author
+        self.ping = ping
+        self.total = total
+        self.pages = (total + PAGE_SIZE - 1) // PAGE_SIZE
+        self.page = 0
+        self.select = Select(placeholder="Pick a quote...", min_values=1, max_values=1)
+        self.select.callback = self.select_callback
+        self.prev_button = Button(label="Prev", style=discord.ButtonStyle.secondary)
+        self.prev_button.callback = self.prev_callback
+        self.next_button = Button(label="Next", style=discord.ButtonStyle.secondary)
+        self.next_button.callback = self.next_callback
+        self.add_item(self.select)
+        if self.pages > 1:
+            self.add_item(self.prev_button)
+            self.add_item(self.next_button)
+
+    def page_label(self):
+        return f"Choose a quote: (page {self.page + 1}/{self.pages}, {self.total} total)"
+
+    async def load_page(self):
+        quotes = await asyncio.to_thread(get_quote_store().page, self.guild.id, self.saver_id, self.author.id, self.page)
+        author_name = self.author.display_name
+        # show author and first 50 chars of quote, value is the store id
+        self.select.options = [
+            SelectOption(label=f'{author_name}: {q["content"][:50] or "[no content]"}'[:100], value=str(q["id"]))
+            for q in quotes
+        ]
+        self.prev_button.disabled = self.page == 0
+        self.next_button.disabled = self.page >= self.pages - 1
+
+    async def prev_callback(self, interaction: discord.Interaction):
+        self.page = max(0, self.page - 1)
+        await self.load_page()
+        await interaction.response.edit_message(content=self.page_label(), view=self)
+
+    async def next_callback(self, interaction: discord.Interaction):
+        self.page = min(self.pages - 1, self.page + 1)
+        await self.load_page()
+        await interaction.response.edit_message(content=self.page_label(), view=self)
+
+    async def select_callback(self, interaction: discord.Interaction):
+        selected_quote = await asyncio.to_thread(get_quote_store().get, int(self.select.values[0]))
+        if not selected_quote:
+            await interaction.response.send_message("That quote no longer exists.", ephemeral=True)
+            return
+        author_id = selected_quote["msg_author_id"]
+        if self.ping:
+            response = f'"{selected_quote["content"]}" — <@{author_id}>'
+        else:
+            author = await self.cog.get_display_name(self.guild, int(author_id))
+            response = f'"{selected_quote["content"]}" — {author}'
+        await interaction.response.send_message(response)
+
+
 async def setup(bot):
     await bot.add_cog(Games(bot))
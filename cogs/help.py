@@ -12,6 +12,7 @@ HELP_PAGES = [
             ("/checkbalance", "look at your balance"),
             ("/roast", "roast yourself (or a friend if youre cool)"),
             ("/recall", "pull quotes saved via save quote"),
+            ("/recallsearch", "search saved quotes by text or author"),
             ("/controller", "open the DDD Plays Pokemon controller"),
             ("/sequence", "send a sequence of controls to the emulator"),
             ("/leaderboard", "see top button mashers"),
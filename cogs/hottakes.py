@@ -1,32 +1,51 @@
+import asyncio
+
 import discord
 from discord import app_commands
 from discord.ext import commands
-import json, os, time
+from utils.hottake_manager import get_hottake_store
 
-DATA_FILE = "data/server_data.json"
 UP = "⬆️"
 DOWN = "⬇️"
+PAGE_SIZE = 5
+
+
+def build_rank_page(guild_id, page: int):
+    # renders straight from the sorted score index, nothing is re-sorted per call
+    store = get_hottake_store()
+    embed = discord.Embed(
+        title="🔥 Most Controversial Hot Takes",
+        color=discord.Color.orange()
+    )
+    for msg_id, info in store.page(guild_id, page, PAGE_SIZE):
+        embed.add_field(
+            name=f"{info['score']} — {info['take']}",
+            value=f"by <@{info['author']}> — 👍 {info['up']} | 👎 {info['down']}",
+            inline=False
+        )
+    embed.set_footer(text=f"Page {page + 1}")
+    return embed
 
-def load_data():
-    if not os.path.exists(DATA_FILE):
-        return {}
-    with open(DATA_FILE, "r") as f:
-        return json.load(f)
-
-def save_data(data):
-    with open(DATA_FILE, "w") as f:
-        json.dump(data, f, indent=4)
 
 class RankTakesView(discord.ui.View):
-    def __init__(self, pages, user):
+    def __init__(self, cog, guild_id, user):
         super().__init__(timeout=60)
-        self.pages = pages
+        self.cog = cog
+        self.guild_id = guild_id
         self.user = user
         self.current_page = 0
 
+    @property
+    def page_count(self):
+        total = get_hottake_store().count(self.guild_id)
+        return max(1, (total + PAGE_SIZE - 1) // PAGE_SIZE)
+
     async def update(self, interaction):
-        embed = self.pages[self.current_page]
-        await interaction.response.edit_message(embed=embed, view=self)
+        # fetching stale takes can take a moment, ack the click first
+        await interaction.response.defer()
+        await self.cog.reconcile_page(self.guild_id, self.current_page)
+        embed = build_rank_page(self.guild_id, self.current_page)
+        await interaction.edit_original_response(embed=embed, view=self)
 
     @discord.ui.button(label="Back", style=discord.ButtonStyle.secondary)
     async def back(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -42,7 +61,7 @@ class RankTakesView(discord.ui.View):
         if interaction.user.id != self.user.id:
             return await interaction.response.send_message("not your menu.", ephemeral=True)
 
-        if self.current_page < len(self.pages) - 1:
+        if self.current_page < self.page_count - 1:
             self.current_page += 1
             await self.update(interaction)
 
@@ -55,30 +74,17 @@ class HotTakes(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    async def cog_load(self):
+        await get_hottake_store().load()
+
+    async def cog_unload(self):
+        await get_hottake_store().flush()
 
     # /hottake — submit a take
     @app_commands.command(name="hottake", description="Submit a hot take and let the server vote.")
     @app_commands.describe(take="Your hot take")
     async def hottake(self, interaction: discord.Interaction, take: str):
 
-        guild_id = str(interaction.guild_id)
-        user_id = interaction.user.id
-
-        data = load_data()
-
-        # ensure guild exists
-        if guild_id not in data:
-            data[guild_id] = {
-                "boosters": [],
-                "staff": [],
-                "cooldowns": {},
-                "takes": {}
-            }
-
-        # ensure "takes" key exists
-        if "takes" not in data[guild_id]:
-            data[guild_id]["takes"] = {}
-
         await interaction.response.defer(ephemeral=False)
 
         # send message
@@ -86,112 +92,102 @@ class HotTakes(commands.Cog):
             f"**Hot Take from {interaction.user.mention}:**\n{take}"
         )
 
+        # track before adding our own reactions so they hit the fast path
+        await get_hottake_store().add(interaction.guild_id, msg.id, interaction.user.id, take, channel_id=msg.channel.id)
+
         # add reactions
         await msg.add_reaction(UP)
         await msg.add_reaction(DOWN)
 
-        # store take
-        data[guild_id]["takes"][str(msg.id)] = {
-            "author": user_id,
-            "take": take,
-            "up": 0,
-            "down": 0,
-            "score": 0,
-            "timestamp": int(time.time())
-        }
-
-        save_data(data)
-
 
 
     # -----------------------------------
-    # Reaction listener
+    # Raw reaction listeners
     # -----------------------------------
-    @commands.Cog.listener()
-    async def on_reaction_add(self, reaction, user):
-
-        if user.bot:
+    # raw events fire even when the message fell out of discord.py's cache,
+    # so counters are bumped in memory and checked against discord on display
+    def _vote_delta(self, payload: discord.RawReactionActionEvent, direction: int):
+        store = get_hottake_store()
+        # one set lookup for every reaction that isn't on a take
+        if not store.is_take(payload.message_id):
             return
-        
-        if reaction.message.guild is None:
+        emoji = str(payload.emoji)
+        if emoji not in (UP, DOWN):
             return
+        if self.bot.user and payload.user_id == self.bot.user.id:
+            return
+        member = payload.member or self.bot.get_user(payload.user_id)
+        if member is not None and member.bot:
+            return
+        if emoji == UP:
+            store.adjust_votes(payload.message_id, up_delta=direction, channel_id=payload.channel_id)
+        else:
+            store.adjust_votes(payload.message_id, down_delta=direction, channel_id=payload.channel_id)
 
-        guild_id = str(reaction.message.guild.id)
-        msg_id = str(reaction.message.id)
+    @commands.Cog.listener()
+    async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent):
+        self._vote_delta(payload, 1)
 
-        data = load_data()
+    @commands.Cog.listener()
+    async def on_raw_reaction_remove(self, payload: discord.RawReactionActionEvent):
+        self._vote_delta(payload, -1)
 
-        if guild_id not in data:
+    async def _reconcile_take(self, msg_id: str, take: dict):
+        channel_id = take.get("channel_id")
+        if not channel_id:
             return
-        if "takes" not in data[guild_id]:
+        channel = self.bot.get_channel(channel_id)
+        try:
+            if channel is None:
+                channel = await self.bot.fetch_channel(channel_id)
+            message = await channel.fetch_message(int(msg_id))
+        except discord.NotFound:
+            # take was deleted, stop trying
+            get_hottake_store().unreconciled.discard(msg_id)
             return
-        if msg_id not in data[guild_id]["takes"]:
-            return
-        
-        if reaction.emoji not in (UP, DOWN):
+        except discord.HTTPException:
             return
 
-        # recount actual reactions
+        # recount actual reactions, minus the bot's own
         up = 0
         down = 0
-
-        for r in reaction.message.reactions:
+        for r in message.reactions:
             if r.emoji == UP:
                 up = r.count - 1
             if r.emoji == DOWN:
                 down = r.count - 1
+        get_hottake_store().reconciled(msg_id, max(0, up), max(0, down))
 
-        tk = data[guild_id]["takes"][msg_id]
-        tk["up"] = up
-        tk["down"] = down
-        tk["score"] = up - down
-
-        save_data(data)
+    async def reconcile_page(self, guild_id, page: int):
+        store = get_hottake_store()
+        stale = [
+            (msg_id, take)
+            for msg_id, take in store.page(guild_id, page, PAGE_SIZE)
+            if msg_id in store.unreconciled
+        ]
+        if stale:
+            await asyncio.gather(*(self._reconcile_take(msg_id, take) for msg_id, take in stale))
 
 
 
     # /ranktakes — most controversial
     @app_commands.command(name="ranktakes", description="Show the server's most controversial hot takes.")
     async def ranktakes(self, interaction: discord.Interaction):
-        guild_id = str(interaction.guild_id)
-        data = load_data()
+        store = get_hottake_store()
+        await store.load()
 
-        if guild_id not in data or "takes" not in data[guild_id] or len(data[guild_id]["takes"]) == 0:
+        if store.count(interaction.guild_id) == 0:
             return await interaction.response.send_message(
                 "no hot takes found for this server.", ephemeral=True
             )
 
-        takes = data[guild_id]["takes"]
-
-        # sort by most controversial (lowest score)
-        ranked = sorted(takes.items(), key=lambda x: x[1]["score"])
-
-        # create pages of 5
-        page_size = 5
-        pages = []
-
-        for i in range(0, len(ranked), page_size):
-            chunk = ranked[i:i + page_size]
-
-            embed = discord.Embed(
-                title="🔥 Most Controversial Hot Takes",
-                color=discord.Color.orange()
-            )
-
-            for msg_id, info in chunk:
-                embed.add_field(
-                    name=f"{info['score']} — {info['take']}",
-                    value=f"by <@{info['author']}> — 👍 {info['up']} | 👎 {info['down']}",
-                    inline=False
-                )
-
-            embed.set_footer(text=f"Page {len(pages) + 1}")
-            pages.append(embed)
+        await interaction.response.defer(ephemeral=True)
+        await self.reconcile_page(interaction.guild_id, 0)
 
         # first page
-        view = RankTakesView(pages, interaction.user)
-        await interaction.response.send_message(
-            embed=pages[0],
+        view = RankTakesView(self, interaction.guild_id, interaction.user)
+        await interaction.followup.send(
+            embed=build_rank_page(interaction.guild_id, 0),
             view=view,
             ephemeral=True
         )
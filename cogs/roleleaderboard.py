@@ -1,7 +1,8 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from utils.admin_manager import get_flavor_roles
+from utils.corpus_manager import get_flavor_names
+from utils.role_index_manager import get_role_index
 
 class RoleLeaderboardView(discord.ui.View):
     def __init__(self, pages):
@@ -48,18 +49,15 @@ class RoleLeaderboard(commands.Cog):
     )
     async def buildroleleaderboard(self, interaction: discord.Interaction):
 
-        roles = interaction.guild.roles
+        guild = interaction.guild
         await interaction.response.defer(ephemeral=True)
-        valid_roles = await get_flavor_roles(interaction)
-        # Build list of (role, member count)
-        role_counts = []
-        for role in roles:
-            if role.name == "@everyone":
-                continue
-            if role.name not in valid_roles:
-                continue
-            count = sum(1 for member in interaction.guild.members if role in member.roles)
-            role_counts.append((role, count))
+        valid_roles = get_flavor_names(guild.id)
+        if not valid_roles:
+            await interaction.followup.send("No flavor roles configured for this server.", ephemeral=True)
+            return
+        # Build list of (role, member count), counts come from the live role index
+        roles = [role for role in guild.roles if role.name != "@everyone" and role.name in valid_roles]
+        role_counts = get_role_index().counts_for(guild, roles)
 
         # Sort largest to smallest
         role_counts.sort(key=lambda r: r[1], reverse=True)
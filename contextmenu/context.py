@@ -8,7 +8,10 @@ from utils.cooldown_manager import *
 
 def make_save_quote_command(bot: commands.Bot):
     async def save_quote_command(interaction: discord.Interaction, message: discord.Message):
-        await save_quote(str(interaction.user.id), message)
+        saved = await save_quote(str(interaction.user.id), message)
+        if not saved:
+            await interaction.response.send_message("You already saved that quote!", ephemeral=True)
+            return
         print(f"Quote saved by user: {interaction.user.name}")
         await interaction.response.send_message("Quote saved!", ephemeral=True)
     return app_commands.ContextMenu(name="Save Quote", callback=save_quote_command)
@@ -5,7 +5,11 @@ import os, json, asyncio
 from dotenv import load_dotenv    
 from utils import booster_manager as boost_m
 from contextmenu.context import make_save_quote_command 
-from utils.delete_log_manager import log_deleted_message
+from utils.delete_log_manager import log_deleted_message, record_audit_entry
+from utils.llm_review_manager import close_review_queue
+from utils.render_manager import get_render_service, shutdown_render_service
+from utils.emulator_manager import close_input_relays, get_press_counter
+from utils.role_index_manager import get_role_index
 from utils.new_member_manager import handle_member_join, enforce_bot_flag
 
 load_dotenv()
@@ -36,6 +40,9 @@ class xBot(commands.Bot):
         #  Sync slash commands 
         await self.sync_commands()
 
+        #  Warm the image render workers 
+        get_render_service().start()
+
         #  Start background tasks 
         refresh_booster_data.start()
         print("Booster data task started.")
@@ -60,6 +67,14 @@ class xBot(commands.Bot):
         except Exception as e:
             print(f"Error syncing commands: {e}")
 
+    async def close(self):
+        #  Drain background workers before the gateway closes 
+        await close_review_queue()
+        shutdown_render_service()
+        await close_input_relays()
+        await get_press_counter().flush()
+        await super().close()
+
 #  Bot instance 
 bot = xBot(command_prefix="!", intents=intents)
 
@@ -71,6 +86,7 @@ async def on_ready():
 
 @bot.event
 async def on_member_update(before: discord.Member, after: discord.Member):
+    get_role_index().member_update(before, after)
     try:
         await boost_m.update_single_user(bot, after)
     except Exception as e:
@@ -82,11 +98,24 @@ async def on_member_update(before: discord.Member, after: discord.Member):
 
 @bot.event
 async def on_member_join(member: discord.Member):
+    get_role_index().member_join(member)
     try:
         await handle_member_join(bot, member)
     except Exception as e:
         print(f"Failed to send welcome embed for {member}: {e}")
 
+@bot.event
+async def on_member_remove(member: discord.Member):
+    get_role_index().member_remove(member)
+
+@bot.event
+async def on_guild_role_delete(role: discord.Role):
+    get_role_index().role_delete(role)
+
+@bot.event
+async def on_guild_remove(guild: discord.Guild):
+    get_role_index().forget(guild.id)
+
 @bot.event
 async def on_message_delete(message):
     if message.author == bot.user:
@@ -96,6 +125,13 @@ async def on_message_delete(message):
     except Exception as e:
         print(f"delete log failed for {message.id}: {e}")
 
+@bot.event
+async def on_audit_log_entry_create(entry: discord.AuditLogEntry):
+    try:
+        record_audit_entry(entry)
+    except Exception as e:
+        print(f"audit cache update failed for {entry.id}: {e}")
+
 @bot.event
 async def on_message(message):
     if message.author == bot.user:
@@ -0,0 +1,53 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.casino_sim_manager import (
+    SLOTS_JACKPOT_MULTIPLIER,
+    SLOTS_PAIR_MULTIPLIER,
+    SLOTS_SYMBOLS,
+    format_report,
+    simulate_blackjack,
+    simulate_slots,
+)
+
+
+def run(name, func, **kwargs):
+    start = time.perf_counter()
+    report = func(**kwargs)
+    elapsed = time.perf_counter() - start
+    print(format_report(report))
+    print(f"  ({elapsed:.2f}s, {report['plays'] / elapsed:,.0f} plays/s)")
+    print()
+
+
+def main(args):
+    if args.game in ("blackjack", "all"):
+        run("blackjack", simulate_blackjack, plays=args.plays, bet=args.bet, stand_on=args.stand_on, seed=args.seed)
+    if args.game in ("slots", "all"):
+        run(
+            "slots",
+            simulate_slots,
+            plays=args.plays,
+            bet=args.bet,
+            symbols=args.symbols,
+            jackpot=args.jackpot,
+            pair=args.pair,
+            seed=args.seed,
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure expected value and economy flow of the gambling commands.")
+    parser.add_argument("--game", choices=["blackjack", "slots", "all"], default="all")
+    parser.add_argument("--plays", type=int, default=1_000_000)
+    parser.add_argument("--bet", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--stand-on", type=int, default=17, help="Blackjack: player hits below this score")
+    parser.add_argument("--symbols", type=int, default=SLOTS_SYMBOLS, help="Slots: symbols per reel")
+    parser.add_argument("--jackpot", type=int, default=SLOTS_JACKPOT_MULTIPLIER, help="Slots: three of a kind multiplier")
+    parser.add_argument("--pair", type=int, default=SLOTS_PAIR_MULTIPLIER, help="Slots: two of a kind multiplier")
+    main(parser.parse_args())
@@ -0,0 +1,71 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.duel_sim_manager import (
+    STRATEGIES,
+    field_scores,
+    format_matrix,
+    load_guild_flavors,
+    rebalance,
+    save_guild_flavors,
+    simulate_pair,
+    win_rate_matrix,
+)
+
+
+def benchmark(duels):
+    stats = {"atk": 10, "def": 8}
+    start = time.perf_counter()
+    simulate_pair(stats, stats, duels)
+    elapsed = time.perf_counter() - start
+    print(f"{duels} duels in {elapsed:.2f}s ({duels / elapsed:,.0f} duels/s)")
+
+
+def main(args):
+    if args.benchmark:
+        benchmark(args.duels)
+        return
+
+    flavors = load_guild_flavors(args.guild)
+    if len(flavors) < 2:
+        print("Need at least two flavors with duel stats.")
+        return
+
+    start = time.perf_counter()
+    names, matrix = win_rate_matrix(flavors, args.duels, args.strategy, args.seed)
+    print(f"Win rates, row beats column ({args.duels} duels per pair, {time.perf_counter() - start:.1f}s):")
+    print(format_matrix(names, matrix))
+    print()
+    for name, score in sorted(field_scores(names, matrix).items(), key=lambda item: -item[1]):
+        print(f"{name}: {score:.3f}  atk {flavors[name]['atk']} / def {flavors[name]['def']}")
+
+    if args.rebalance is None:
+        return
+    stats, scores, reached = rebalance(flavors, args.rebalance, args.duels, args.strategy, seed=args.seed, initial=(names, matrix))
+    spread = max(scores.values()) - min(scores.values())
+    outcome = "reached" if reached else "not reached, closest found"
+    print(f"\nRebalanced toward a spread of {args.rebalance} ({outcome}: {spread:.3f}):")
+    for name in sorted(stats, key=lambda key: -scores[key]):
+        print(f"{name}: {scores[name]:.3f}  atk {stats[name]['atk']} / def {stats[name]['def']}")
+    if args.write:
+        save_guild_flavors(args.guild, stats)
+        print("server_data.json updated.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monte Carlo duel balance check for a guild's flavors.")
+    parser.add_argument("--guild", help="Guild id whose flavor_roles to simulate")
+    parser.add_argument("--duels", type=int, default=100_000, help="Duels per flavor pair")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="random")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--rebalance", type=float, default=None, metavar="SPREAD", help="Suggest stats within this score spread")
+    parser.add_argument("--write", action="store_true", help="Save rebalanced stats to server_data.json")
+    parser.add_argument("--benchmark", action="store_true", help="Time one mirror matchup and exit")
+    args = parser.parse_args()
+    if not args.benchmark and not args.guild:
+        parser.error("--guild is required unless --benchmark is set")
+    main(args)
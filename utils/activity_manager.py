@@ -0,0 +1,157 @@
+"""
+Rolling per-channel message counters so /roast never has to walk channel history
+"""
+
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+
+import discord
+
+from utils.json_manager import load_json, write_json
+
+ACTIVITY_FILE = "data/activity.json"
+WINDOW_HOURS = 24 * 7
+BACKFILL_LIMIT = 5000
+
+
+def _hour_of(moment: datetime):
+    return int(moment.timestamp() // 3600)
+
+
+class ChannelActivity:
+    """Hour buckets for one channel, each bucket is {user id: count} plus a total."""
+
+    __slots__ = ("buckets", "totals")
+
+    def __init__(self):
+        # hour since epoch -> {user id: count}
+        self.buckets = {}
+        # hour since epoch -> total messages that hour
+        self.totals = {}
+
+    def add(self, hour: int, user_id: str, amount: int = 1):
+        bucket = self.buckets.setdefault(hour, {})
+        bucket[user_id] = bucket.get(user_id, 0) + amount
+        self.totals[hour] = self.totals.get(hour, 0) + amount
+
+    def prune(self, oldest_hour: int):
+        for hour in [hour for hour in self.totals if hour < oldest_hour]:
+            self.totals.pop(hour, None)
+            self.buckets.pop(hour, None)
+
+    def counts(self, user_id: str, oldest_hour: int):
+        # at most WINDOW_HOURS buckets, independent of channel traffic
+        total = 0
+        user = 0
+        for hour, count in self.totals.items():
+            if hour < oldest_hour:
+                continue
+            total += count
+            user += self.buckets[hour].get(user_id, 0)
+        return user, total
+
+    def to_dict(self):
+        # copies, the snapshot is written from a worker thread while new messages come in
+        return {str(hour): dict(bucket) for hour, bucket in self.buckets.items()}
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        activity = cls()
+        for hour, bucket in data.items():
+            for user_id, count in bucket.items():
+                activity.add(int(hour), user_id, count)
+        return activity
+
+
+class ActivityTracker:
+    """On_message driven message counts per channel and user over the last week.
+
+    State lives in memory and is flushed to ACTIVITY_FILE periodically along
+    with the flush time. On startup channels are backfilled from history between
+    the last flush and the moment live tracking started, which covers downtime
+    and unflushed messages without counting anything twice.
+    """
+
+    def __init__(self, path: str = ACTIVITY_FILE):
+        self.path = path
+        self.started_at = datetime.now(timezone.utc)
+        self.channels = {}
+        self.last_flush = None
+        self.dirty = False
+        self._backfill_lock = asyncio.Lock()
+        self._load()
+
+    def _load(self):
+        data = load_json(self.path, {})
+        oldest = self._oldest_hour()
+        for channel_id, buckets in data.get("channels", {}).items():
+            activity = ChannelActivity.from_dict(buckets)
+            activity.prune(oldest)
+            self.channels[channel_id] = activity
+        last_flush = data.get("last_flush")
+        if last_flush is None and os.path.exists(self.path):
+            # files from before last_flush was stored, the write time is the same thing
+            last_flush = os.path.getmtime(self.path)
+        if last_flush is not None:
+            self.last_flush = datetime.fromtimestamp(last_flush, timezone.utc)
+
+    def _oldest_hour(self):
+        return _hour_of(datetime.now(timezone.utc)) - WINDOW_HOURS + 1
+
+    def record(self, message: discord.Message):
+        channel_id = str(message.channel.id)
+        activity = self.channels.get(channel_id)
+        if activity is None:
+            activity = self.channels[channel_id] = ChannelActivity()
+        activity.add(_hour_of(message.created_at), str(message.author.id))
+        self.dirty = True
+
+    def counts(self, channel_id: int, user_id: int):
+        """(messages by user, messages total) in the channel over the last week."""
+        activity = self.channels.get(str(channel_id))
+        if activity is None:
+            return 0, 0
+        return activity.counts(str(user_id), self._oldest_hour())
+
+    async def flush(self, force: bool = False):
+        if not self.dirty:
+            return
+        # the file must not claim a newer last_flush than the backfill has covered,
+        # a restart mid-backfill then just redoes it from the old one
+        if self._backfill_lock.locked() and not force:
+            return
+        oldest = self._oldest_hour()
+        for activity in self.channels.values():
+            activity.prune(oldest)
+        self.last_flush = datetime.now(timezone.utc)
+        data = {
+            "channels": {channel_id: activity.to_dict() for channel_id, activity in self.channels.items()},
+            "last_flush": self.last_flush.timestamp(),
+        }
+        self.dirty = False
+        await asyncio.to_thread(write_json, data, self.path)
+
+    async def backfill_channel(self, channel: discord.TextChannel, after: datetime):
+        activity = self.channels.setdefault(str(channel.id), ChannelActivity())
+        try:
+            async for msg in channel.history(limit=BACKFILL_LIMIT, after=after, before=self.started_at):
+                activity.add(_hour_of(msg.created_at), str(msg.author.id))
+                self.dirty = True
+        except (discord.Forbidden, discord.HTTPException):
+            return
+
+    async def backfill(self, guilds):
+        # one pass on startup over the gap between the last flush and now
+        async with self._backfill_lock:
+            after = self.started_at - timedelta(hours=WINDOW_HOURS)
+            if self.last_flush and self.last_flush > after:
+                after = self.last_flush
+            for guild in guilds:
+                me = guild.me
+                for channel in guild.text_channels:
+                    if me and not channel.permissions_for(me).read_message_history:
+                        continue
+                    await self.backfill_channel(channel, after)
+            self.dirty = True
+            await self.flush(force=True)
@@ -1,11 +1,15 @@
+import asyncio
 import random
+import threading
+from collections import OrderedDict
 from datetime import datetime, timezone
+from functools import lru_cache
 from io import BytesIO
 from typing import Dict, List, Optional, Tuple
 
 from PIL import Image, ImageDraw, ImageFont
 
-from utils.json_manager import load_json_async, write_json_async
+from utils.json_manager import load_json_async, merge_json_async
 
 USER_DATA_FILE = "data/user_data.json"
 SERVER_DATA_FILE = "data/server_data.json"
@@ -25,10 +29,6 @@ async def _load_user_data():
     return await load_json_async(USER_DATA_FILE, {})
 
 
-async def _write_user_data(data: Dict):
-    await write_json_async(data, USER_DATA_FILE)
-
-
 async def get_flavor_pool(guild_id: int) :
     data = await _load_server_data()
     guild_entry = data.get(str(guild_id), {})
@@ -43,19 +43,144 @@ async def get_flavor_pool(guild_id: int) :
     return unique
 
 
-def _build_cells_from_pool(pool: List[str], size: int):
+def _build_line_masks(size: int):
+    rows = [sum(1 << (row * size + col) for col in range(size)) for row in range(size)]
+    cols = [sum(1 << (row * size + col) for row in range(size)) for col in range(size)]
+    diagonal = sum(1 << (i * size + i) for i in range(size))
+    anti_diagonal = sum(1 << (i * size + (size - 1 - i)) for i in range(size))
+    return tuple(rows + cols + [diagonal, anti_diagonal])
+
+
+# every row, column and diagonal as a cell bitmask, a line is complete when mask & line == line
+WIN_LINES = {size: _build_line_masks(size) for size in (3, 5)}
+
+
+class BingoBoard:
+    """Compact bingo board: a label array plus an integer bitmask of marked cells.
+
+    Stored in user_data.json as {"size", "labels", "marked", "updated_at"};
+    older boards saved as a list of {"label", "marked"} cells are converted
+    on load.
+    """
+
+    __slots__ = ("size", "labels", "marked", "updated_at", "_lookup")
+
+    def __init__(self, size: int, labels: List[str], marked: int = 0, updated_at: Optional[str] = None):
+        self.size = size
+        self.labels = tuple(labels)
+        self.marked = marked
+        self.updated_at = updated_at
+        # casefolded label -> cell index, so marking never scans the board
+        self._lookup = {}
+        for index, label in enumerate(self.labels):
+            self._lookup.setdefault(label.casefold(), index)
+
+    @classmethod
+    def from_dict(cls, data: Dict):
+        size = data.get("size", 5)
+        if "labels" in data:
+            return cls(size, data["labels"], int(data.get("marked", 0)), data.get("updated_at"))
+        cells = data.get("cells", [])
+        marked = 0
+        for index, cell in enumerate(cells):
+            if cell.get("marked"):
+                marked |= 1 << index
+        return cls(size, [cell.get("label", "") for cell in cells], marked, data.get("updated_at"))
+
+    def to_dict(self):
+        return {
+            "size": self.size,
+            "labels": list(self.labels),
+            "marked": self.marked,
+            "updated_at": self.updated_at,
+        }
+
+    @property
+    def free_mask(self):
+        index = self._lookup.get(FREE_SPACE_LABEL.casefold())
+        return 1 << index if index is not None else 0
+
+    def index_of(self, flavor_name: str):
+        return self._lookup.get(flavor_name.strip().casefold())
+
+    def is_marked(self, index: int):
+        return bool(self.marked >> index & 1)
+
+    def mark(self, flavor_name: str):
+        index = self.index_of(flavor_name)
+        if index is None or self.is_marked(index):
+            return False
+        self.marked |= 1 << index
+        self.updated_at = _now_iso()
+        return True
+
+    def completed_lines(self):
+        # free space counts toward lines without being drawn as crossed off
+        covered = self.marked | self.free_mask
+        return [line for line in WIN_LINES.get(self.size, ()) if covered & line == line]
+
+
+def _build_labels_from_pool(pool: List[str], size: int):
     total_cells = size * size
     needed = total_cells - 1  # center slot always free
     chosen = random.sample(pool, needed)
     center_index = total_cells // 2
-    cells = []
-    flavor_iter = iter(chosen)
-    for idx in range(total_cells):
-        if idx == center_index:
-            cells.append({"label": FREE_SPACE_LABEL, "marked": False})
-        else:
-            cells.append({"label": next(flavor_iter), "marked": False})
-    return cells
+    chosen.insert(center_index, FREE_SPACE_LABEL)
+    return chosen
+
+
+class _GuildBoards:
+    """Every board in one guild plus an inverted flavor -> user ids index."""
+
+    def __init__(self):
+        # user id -> board
+        self.boards = {}
+        # casefolded flavor -> set of user ids whose board has it
+        self.flavor_index = {}
+
+    def put(self, user_id: str, board: BingoBoard):
+        self.discard(user_id)
+        self.boards[user_id] = board
+        for key in board._lookup:
+            self.flavor_index.setdefault(key, set()).add(user_id)
+
+    def discard(self, user_id: str):
+        board = self.boards.pop(user_id, None)
+        if board is None:
+            return
+        for key in board._lookup:
+            holders = self.flavor_index.get(key)
+            if holders is not None:
+                holders.discard(user_id)
+                if not holders:
+                    del self.flavor_index[key]
+
+    def holders(self, flavor_name: str):
+        return self.flavor_index.get(flavor_name.strip().casefold(), set())
+
+
+_GUILD_BOARDS = {}
+_BOARDS_LOCK = asyncio.Lock()
+
+
+async def _guild_boards(guild_id: int):
+    guild_key = str(guild_id)
+    boards = _GUILD_BOARDS.get(guild_key)
+    if boards is not None:
+        return boards
+    async with _BOARDS_LOCK:
+        boards = _GUILD_BOARDS.get(guild_key)
+        if boards is not None:
+            return boards
+        # one pass over user_data.json builds the whole guild index
+        data = await _load_user_data()
+        boards = _GuildBoards()
+        for user_id, user_entry in data.get(guild_key, {}).items():
+            raw = user_entry.get("bingo") if isinstance(user_entry, dict) else None
+            if raw:
+                boards.put(user_id, BingoBoard.from_dict(raw))
+        _GUILD_BOARDS[guild_key] = boards
+        return boards
 
 
 async def create_board(guild_id: int, user_id: int, size: int):
@@ -64,40 +189,61 @@ async def create_board(guild_id: int, user_id: int, size: int):
     needed = total_cells - 1
     if len(pool) < needed:
         raise ValueError(f"Need at least {needed} available flavors to build a {size}×{size} board. Ask an admin to run /addavailabledew.")
-    board = {
-        "size": size,
-        "cells": _build_cells_from_pool(pool, size),
-        "updated_at": _now_iso(),
-    }
+    board = BingoBoard(size, _build_labels_from_pool(pool, size), updated_at=_now_iso())
     await save_board(guild_id, user_id, board)
     return board
 
 
-async def save_board(guild_id: int, user_id: int, board: Dict):
-    data = await _load_user_data()
-    guild_entry = data.setdefault(str(guild_id), {})
-    user_entry = guild_entry.setdefault(str(user_id), {})
-    user_entry["bingo"] = board
-    await _write_user_data(data)
+async def save_board(guild_id: int, user_id: int, board: BingoBoard):
+    boards = await _guild_boards(guild_id)
+    boards.put(str(user_id), board)
+    await save_boards(guild_id, {str(user_id): board})
+
+
+async def save_boards(guild_id: int, changed: Dict[str, BingoBoard]):
+    # one locked read + write no matter how many boards changed, other keys in the file survive
+    if not changed:
+        return
+
+    def merge(data):
+        guild_entry = data.setdefault(str(guild_id), {})
+        for user_id, board in changed.items():
+            user_entry = guild_entry.setdefault(str(user_id), {})
+            user_entry["bingo"] = board.to_dict()
+
+    await merge_json_async(USER_DATA_FILE, merge, {})
 
 
 async def get_board(guild_id: int, user_id: int):
-    data = await _load_user_data()
-    return data.get(str(guild_id), {}).get(str(user_id), {}).get("bingo")
+    boards = await _guild_boards(guild_id)
+    return boards.boards.get(str(user_id))
+
+
+async def mark_flavor_for_guild(guild_id: int, flavor_name: str):
+    """Cross `flavor_name` off every board in the guild that has it.
+
+    Returns (changed boards by user id, user ids that completed a new line).
+    """
+    boards = await _guild_boards(guild_id)
+    changed = {}
+    winners = []
+    for user_id in list(boards.holders(flavor_name)):
+        board = boards.boards[user_id]
+        lines_before = len(board.completed_lines())
+        if not board.mark(flavor_name):
+            continue
+        changed[user_id] = board
+        if len(board.completed_lines()) > lines_before:
+            winners.append(user_id)
+    await save_boards(guild_id, changed)
+    return changed, winners
 
 
 async def mark_flavor(guild_id: int, user_id: int, flavor_name: str):
     board = await get_board(guild_id, user_id)
     if not board:
         return False, None
-    normalized = flavor_name.strip().casefold()
-    changed = False
-    for cell in board.get("cells", []):
-        if cell["label"].casefold() == normalized and not cell.get("marked"):
-            cell["marked"] = True
-            board["updated_at"] = _now_iso()
-            changed = True
-            break
+    changed = board.mark(flavor_name)
     if changed:
         await save_board(guild_id, user_id, board)
     return changed, board
@@ -121,24 +267,36 @@ def _wrap_text(label: str, font: ImageFont.ImageFont, max_width: int):
     return lines
 
 
-def _fit_text(label: str, cell_size: int, draw: ImageDraw.ImageDraw):
+# scratch surface for measuring text, layouts never touch the real canvas
+_MEASURE_DRAW = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+
+
+@lru_cache(maxsize=512)
+def _fit_text(label: str, cell_size: int):
+    # returns (lines, font size, text width, text height), memoized per label + cell size
     max_width = cell_size - 100
     max_height = cell_size - 40
     size = max(54, int(cell_size * 0.23))
     while size >= 28:
         font = _load_font(size)
         lines = _wrap_text(label, font, max_width)
-        text = "\n".join(lines)
-        bbox = draw.multiline_textbbox((0, 0), text, font=font, align="center", spacing=6)
-        width = bbox[2] - bbox[0]
-        height = bbox[3] - bbox[1]
+        width, height = _measure_lines(lines, font)
         if width <= max_width and height <= max_height:
-            return lines, font
+            return tuple(lines), size, width, height
         size -= 2
     font = _load_font(28)
-    return _wrap_text(label, font, max_width), font
+    lines = _wrap_text(label, font, max_width)
+    width, height = _measure_lines(lines, font)
+    return tuple(lines), 28, width, height
+
 
+def _measure_lines(lines: List[str], font: ImageFont.ImageFont):
+    bbox = _MEASURE_DRAW.multiline_textbbox((0, 0), "\n".join(lines), font=font, align="center", spacing=6)
+    return bbox[2] - bbox[0], bbox[3] - bbox[1]
 
+
+# truetype parses the font file on every call, so keep one instance per size
+@lru_cache(maxsize=64)
 def _load_font(size: int):
     for path in (FONT_PATH, "DejaVuSans-Bold.ttf", "Arial.ttf"):
         try:
@@ -148,9 +306,18 @@ def _load_font(size: int):
     return ImageFont.load_default()
 
 
-def render_board(board: Dict):
-    size = board.get("size", 5)
-    cells = board.get("cells", [])
+LETTER_COLOR = (20, 24, 36)
+LINE_COLOR = (206, 212, 218)
+MARK_FILL = (234, 244, 234)
+MARK_STRIKE = (200, 0, 0)
+MARK_INSET = 12
+# finished pngs per (labels, marked bitmask, stamp), tiny compared to the render cost
+PNG_CACHE_SIZE = 256
+_PNG_CACHE = OrderedDict()
+_PNG_CACHE_LOCK = threading.Lock()
+
+
+def _board_geometry(size: int):
     cell_size = 280 if size == 3 else 230
     margin = 80
     header_space = 180
@@ -158,64 +325,166 @@ def render_board(board: Dict):
     grid_top = margin + header_space
     grid_right = grid_left + size * cell_size
     grid_bottom = grid_top + size * cell_size
-    width = grid_right + margin
-    height = grid_bottom + margin
-
-    image = Image.new("RGB", (width, height), color=(255, 255, 255))
-    draw = ImageDraw.Draw(image)
-
-    header_letters = "BINGO"[:size]
-    header_font = _load_font(int(cell_size * 0.35))
-    letter_color = (20, 24, 36)
-    for idx, letter in enumerate(header_letters):
-        center_x = grid_left + idx * cell_size + cell_size / 2
-        bbox = header_font.getbbox(letter)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
-        text_x = center_x - text_width / 2
-        text_y = margin
-        draw.text((text_x, text_y), letter, fill=letter_color, font=header_font)
-
-    line_color = (206, 212, 218)
-    draw.rounded_rectangle((grid_left, grid_top, grid_right, grid_bottom), radius=50, outline=line_color, width=6)
-    for i in range(1, size):
-        y = grid_top + i * cell_size
-        draw.line((grid_left, y, grid_right, y), fill=line_color, width=4)
-        x = grid_left + i * cell_size
-        draw.line((x, grid_top, x, grid_bottom), fill=line_color, width=4)
-
-    for index, cell in enumerate(cells):
-        row, col = divmod(index, size)
-        x0 = grid_left + col * cell_size
-        y0 = grid_top + row * cell_size
-        x1 = x0 + cell_size
-        y1 = y0 + cell_size
-
-        if cell.get("marked"):
-            fill_box = (x0 + 12, y0 + 12, x1 - 12, y1 - 12)
-            draw.rounded_rectangle(fill_box, radius=30, fill=(234, 244, 234))
-
-        label = cell.get("label", "")
-        lines, text_font = _fit_text(label, cell_size, draw)
-        text = "\n".join(lines)
-        text_bbox = draw.multiline_textbbox((0, 0), text, font=text_font, align="center", spacing=6)
-        text_width = text_bbox[2] - text_bbox[0]
-        text_height = text_bbox[3] - text_bbox[1]
-        text_x = x0 + (cell_size - text_width) / 2
-        text_y = y0 + (cell_size - text_height) / 2
-        draw.multiline_text((text_x, text_y), text, fill=letter_color, font=text_font, align="center", spacing=6)
-
-        if cell.get("marked"):
-            line_y = y0 + cell_size / 2
-            draw.line((x0 + 40, line_y, x1 - 40, line_y), fill=(200, 0, 0), width=12)
-
-    updated_at = board.get("updated_at")
+    return {
+        "cell_size": cell_size,
+        "margin": margin,
+        "grid_left": grid_left,
+        "grid_top": grid_top,
+        "grid_right": grid_right,
+        "grid_bottom": grid_bottom,
+        "width": grid_right + margin,
+        "height": grid_bottom + margin,
+    }
+
+
+def _cell_box(geometry: Dict, size: int, index: int):
+    row, col = divmod(index, size)
+    cell_size = geometry["cell_size"]
+    x0 = geometry["grid_left"] + col * cell_size
+    y0 = geometry["grid_top"] + row * cell_size
+    return x0, y0, x0 + cell_size, y0 + cell_size
+
+
+def _draw_label(draw: ImageDraw.ImageDraw, label: str, x0: float, y0: float, cell_size: int):
+    lines, font_size, text_width, text_height = _fit_text(label, cell_size)
+    text_x = x0 + (cell_size - text_width) / 2
+    text_y = y0 + (cell_size - text_height) / 2
+    draw.multiline_text(
+        (text_x, text_y), "\n".join(lines), fill=LETTER_COLOR, font=_load_font(font_size), align="center", spacing=6
+    )
+
+
+class _BoardLayers:
+    """Static base image for one board layout plus lazily built marked-cell tiles."""
+
+    def __init__(self, size: int, labels: Tuple[str, ...]):
+        self.size = size
+        self.labels = labels
+        self.geometry = _board_geometry(size)
+        self.base = self._render_base()
+        self._tiles = {}
+        self._lock = threading.Lock()
+
+    def _render_base(self):
+        geometry = self.geometry
+        cell_size = geometry["cell_size"]
+        image = Image.new("RGB", (geometry["width"], geometry["height"]), color=(255, 255, 255))
+        draw = ImageDraw.Draw(image)
+
+        header_font = _load_font(int(cell_size * 0.35))
+        for idx, letter in enumerate("BINGO"[: self.size]):
+            center_x = geometry["grid_left"] + idx * cell_size + cell_size / 2
+            bbox = header_font.getbbox(letter)
+            text_x = center_x - (bbox[2] - bbox[0]) / 2
+            draw.text((text_x, geometry["margin"]), letter, fill=LETTER_COLOR, font=header_font)
+
+        grid_left, grid_top = geometry["grid_left"], geometry["grid_top"]
+        grid_right, grid_bottom = geometry["grid_right"], geometry["grid_bottom"]
+        draw.rounded_rectangle((grid_left, grid_top, grid_right, grid_bottom), radius=50, outline=LINE_COLOR, width=6)
+        for i in range(1, self.size):
+            y = grid_top + i * cell_size
+            draw.line((grid_left, y, grid_right, y), fill=LINE_COLOR, width=4)
+            x = grid_left + i * cell_size
+            draw.line((x, grid_top, x, grid_bottom), fill=LINE_COLOR, width=4)
+
+        for index, label in enumerate(self.labels):
+            x0, y0, _, _ = _cell_box(geometry, self.size, index)
+            _draw_label(draw, label, x0, y0, cell_size)
+        return image
+
+    def tile(self, index: int):
+        # marked version of the cell's inset area, cut from the base so borders stay intact
+        cached = self._tiles.get(index)
+        if cached is not None:
+            return cached
+        with self._lock:
+            cached = self._tiles.get(index)
+            if cached is not None:
+                return cached
+            cell_size = self.geometry["cell_size"]
+            x0, y0, x1, y1 = _cell_box(self.geometry, self.size, index)
+            # pillow boxes are inclusive, crop boxes are not, hence the +1
+            box = (x0 + MARK_INSET, y0 + MARK_INSET, x1 - MARK_INSET + 1, y1 - MARK_INSET + 1)
+            tile = self.base.crop(box)
+            draw = ImageDraw.Draw(tile)
+            draw.rounded_rectangle((0, 0, tile.width - 1, tile.height - 1), radius=30, fill=MARK_FILL)
+            _draw_label(draw, self.labels[index], -MARK_INSET, -MARK_INSET, cell_size)
+            line_y = cell_size / 2 - MARK_INSET
+            draw.line((40 - MARK_INSET, line_y, cell_size - 40 - MARK_INSET, line_y), fill=MARK_STRIKE, width=12)
+            cached = (tile, box[:2])
+            self._tiles[index] = cached
+            return cached
+
+
+@lru_cache(maxsize=64)
+def _board_layers(size: int, labels: Tuple[str, ...]):
+    return _BoardLayers(size, labels)
+
+
+def _compose_png(layers: _BoardLayers, mask: int, updated_at: Optional[str], compress_level: int = 6, optimize: bool = False):
+    image = layers.base.copy()
+    index = 0
+    remaining = mask
+    while remaining:
+        if remaining & 1:
+            tile, position = layers.tile(index)
+            image.paste(tile, position)
+        remaining >>= 1
+        index += 1
+
     if updated_at:
-        date_font = _load_font(36)
+        draw = ImageDraw.Draw(image)
+        geometry = layers.geometry
         stamp = f"Updated: {updated_at.split('T')[0]}"
-        draw.text((grid_left, grid_bottom + 20), stamp, fill=(120, 120, 120), font=date_font)
+        draw.text((geometry["grid_left"], geometry["grid_bottom"] + 20), stamp, fill=(120, 120, 120), font=_load_font(36))
 
     output = BytesIO()
-    image.save(output, format="PNG")
-    output.seek(0)
-    return output
+    image.save(output, format="PNG", compress_level=compress_level, optimize=optimize)
+    return output.getvalue()
+
+
+def _png_key(board: BingoBoard, compress_level: int, optimize: bool):
+    # only the date is drawn, so boards updated the same day share a png
+    stamp = board.updated_at.split("T")[0] if board.updated_at else None
+    return (board.size, board.labels, board.marked, stamp, compress_level, optimize)
+
+
+def cached_board_png(board: BingoBoard, compress_level: int = 6, optimize: bool = False):
+    key = _png_key(board, compress_level, optimize)
+    with _PNG_CACHE_LOCK:
+        png = _PNG_CACHE.get(key)
+        if png is not None:
+            _PNG_CACHE.move_to_end(key)
+        return png
+
+
+def remember_board_png(board: BingoBoard, png: bytes, compress_level: int = 6, optimize: bool = False):
+    key = _png_key(board, compress_level, optimize)
+    with _PNG_CACHE_LOCK:
+        _PNG_CACHE[key] = png
+        _PNG_CACHE.move_to_end(key)
+        while len(_PNG_CACHE) > PNG_CACHE_SIZE:
+            _PNG_CACHE.popitem(last=False)
+
+
+def render_board_png(board: BingoBoard, compress_level: int = 6, optimize: bool = False):
+    png = cached_board_png(board, compress_level, optimize)
+    if png is not None:
+        return png
+    layers = _board_layers(board.size, board.labels)
+    png = _compose_png(layers, board.marked, board.updated_at, compress_level, optimize)
+    remember_board_png(board, png, compress_level, optimize)
+    return png
+
+
+def render_board(board: BingoBoard):
+    return BytesIO(render_board_png(board))
+
+
+def warm_fonts():
+    # every size the renderer can ask for, so a fresh worker never hits the disk mid-render
+    for cell_size in (230, 280):
+        _load_font(int(cell_size * 0.35))
+        for size in range(max(54, int(cell_size * 0.23)), 27, -2):
+            _load_font(size)
+    _load_font(36)
@@ -1,5 +1,5 @@
+import os
 import random
-from typing import List
 
 RANKS = ["2","3","4","5","6","7","8","9","10","J","Q","K","A"]
 # replace suits with Dew-can themed emojis used in the bot
@@ -10,36 +10,105 @@ SUITS = [
     "<:bajablastcan:1427060298510106766>",
 ]
 
-def make_deck(decks: int = 1) :
-    # store cards as "RANK|SUIT" so suits (which may be multi-char emojis) can be parsed reliably
-    deck = [f"{r}|{s}" for r in RANKS for s in SUITS] * decks
-    random.shuffle(deck)
-    return deck
-
-def card_value(card: str) :
-    # card format is "RANK|SUIT"; split on the first '|'
-    rank, _ = card.split("|", 1)
-    if rank in ("J","Q","K"):
-        return [10]
-    if rank == "A":
-        return [1,11]
-    return [int(rank)]
-
-def score_hand(cards: List[str]) :
-    # compute best score <=21 or minimum otherwise
-    totals = [0]
-    for c in cards:
-        vals = card_value(c)
-        new = []
-        for t in totals:
-            for v in vals:
-                new.append(t+v)
-        totals = new
-    # choose best <=21
-    valid = [t for t in totals if t <= 21]
-    if valid:
-        return max(valid)
-    return min(totals)
-
-def is_blackjack(cards: List[str]) :
-    return len(cards) == 2 and (11 in sum([card_value(c) for c in cards], [])) and any(v==10 for c in cards for v in card_value(c))
+SHOE_DECKS = int(os.getenv("BLACKJACK_SHOE_DECKS", "6") or 6)
+# fraction of the shoe dealt before the cut card forces a reshuffle
+SHOE_PENETRATION = float(os.getenv("BLACKJACK_SHOE_PENETRATION", "0.75") or 0.75)
+
+# a card is an int 0-51: rank index = card % 13, suit index = card // 13
+ACE = RANKS.index("A")
+# points per card with aces counted as 1, the soft +10 is handled by Hand
+CARD_POINTS = tuple(1 if card % 13 == ACE else min(10, card % 13 + 2) for card in range(52))
+CARD_LABELS = tuple(f"{RANKS[card % 13]}{SUITS[card // 13]}" for card in range(52))
+
+
+def is_ace(card: int) :
+    return card % 13 == ACE
+
+
+def card_label(card: int) :
+    return CARD_LABELS[card]
+
+
+class Hand:
+    """Cards plus running (hard total, aces) so scoring a hit is O(1)."""
+
+    __slots__ = ("cards", "hard", "aces")
+
+    def __init__(self, cards=()):
+        self.cards = []
+        self.hard = 0
+        self.aces = 0
+        for card in cards:
+            self.add(card)
+
+    def add(self, card: int):
+        self.cards.append(card)
+        self.hard += CARD_POINTS[card]
+        if is_ace(card):
+            self.aces += 1
+
+    @property
+    def soft(self):
+        # at most one ace can count as 11 without busting
+        return self.aces > 0 and self.hard + 10 <= 21
+
+    @property
+    def score(self):
+        return self.hard + 10 if self.soft else self.hard
+
+    @property
+    def busted(self):
+        return self.hard > 21
+
+    @property
+    def blackjack(self):
+        return len(self.cards) == 2 and self.score == 21
+
+    def labels(self, hide_second: bool = False):
+        return " ".join("??" if hide_second and i == 1 else CARD_LABELS[card] for i, card in enumerate(self.cards))
+
+
+class Shoe:
+    """Several decks shuffled together and dealt until the cut card comes out.
+
+    Reshuffling only happens between rounds (`start_round`), like a real
+    table, unless a round somehow runs the shoe dry.
+    """
+
+    def __init__(self, decks: int = SHOE_DECKS, penetration: float = SHOE_PENETRATION, rng: random.Random = None):
+        self.decks = max(1, decks)
+        self.rng = rng or random.Random()
+        self.cards = list(range(52)) * self.decks
+        self.cut = int(len(self.cards) * min(0.95, max(0.1, penetration)))
+        self.pos = 0
+        self.shuffle()
+
+    def shuffle(self):
+        self.rng.shuffle(self.cards)
+        self.pos = 0
+
+    def start_round(self):
+        if self.pos >= self.cut:
+            self.shuffle()
+
+    def draw(self) :
+        if self.pos >= len(self.cards):
+            self.shuffle()
+        card = self.cards[self.pos]
+        self.pos += 1
+        return card
+
+    @property
+    def remaining(self):
+        return len(self.cards) - self.pos
+
+
+_SHOE = None
+
+
+def get_shoe():
+    global _SHOE
+    if _SHOE is None:
+        _SHOE = Shoe()
+    return _SHOE
+
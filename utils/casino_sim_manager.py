@@ -0,0 +1,177 @@
+"""
+Vectorized payout simulations for /blackjack and /gamble so odds changes can be measured first
+"""
+
+import numpy as np
+
+from utils.blackjack_manager import CARD_POINTS
+
+# mirrors cogs/blackjack.py finish(), keep in step
+BLACKJACK_PAYOUT = 1.5
+DEALER_STANDS_ON = 17
+# mirrors cogs/gamble.py play_slots(), keep in step
+SLOTS_SYMBOLS = 6
+SLOTS_JACKPOT_MULTIPLIER = 5
+SLOTS_PAIR_MULTIPLIER = 2
+
+# plays per numpy batch, bounds memory for runs in the millions
+CHUNK = 1_000_000
+# one entry per rank, aces as 1
+RANK_POINTS = np.array(CARD_POINTS[:13], dtype=np.int64)
+ACE_RANK = 12
+
+
+class _Hands:
+    """Hard totals and ace counts for a batch of hands, same scoring as blackjack_manager.Hand."""
+
+    def __init__(self, n):
+        self.hard = np.zeros(n, dtype=np.int64)
+        self.aces = np.zeros(n, dtype=np.int64)
+        self.cards = np.zeros(n, dtype=np.int64)
+
+    def add(self, ranks, mask=None):
+        points = RANK_POINTS[ranks]
+        aces = ranks == ACE_RANK
+        if mask is not None:
+            points = np.where(mask, points, 0)
+            aces = aces & mask
+            self.cards += mask
+        else:
+            self.cards += 1
+        self.hard += points
+        self.aces += aces
+
+    @property
+    def score(self):
+        soft = (self.aces > 0) & (self.hard + 10 <= 21)
+        return np.where(soft, self.hard + 10, self.hard)
+
+    @property
+    def blackjack(self):
+        return (self.cards == 2) & (self.score == 21)
+
+
+def _blackjack_chunk(n, bet, stand_on, rng):
+    # infinite-deck approximation, each card is an independent uniform rank
+    player = _Hands(n)
+    dealer = _Hands(n)
+    for _ in range(2):
+        player.add(rng.integers(0, 13, n))
+        dealer.add(rng.integers(0, 13, n))
+
+    # player hits below stand_on, the bot has no doubles or splits
+    while True:
+        hitting = player.score < stand_on
+        if not hitting.any():
+            break
+        player.add(rng.integers(0, 13, n), hitting)
+
+    while True:
+        hitting = dealer.score < DEALER_STANDS_ON
+        if not hitting.any():
+            break
+        dealer.add(rng.integers(0, 13, n), hitting)
+
+    pscore, dscore = player.score, dealer.score
+    bust = pscore > 21
+    natural = ~bust & player.blackjack & ~dealer.blackjack
+    win = ~bust & ~natural & ((dscore > 21) | (pscore > dscore))
+    push = ~bust & ~natural & ~win & (pscore == dscore)
+    # net coins per play relative to the bet already taken, in the same order finish() checks
+    net = np.full(n, -bet, dtype=np.int64)
+    net[natural] = int(bet * BLACKJACK_PAYOUT)
+    net[win] = bet
+    net[push] = 0
+    outcomes = {
+        "bust": np.count_nonzero(bust),
+        "blackjack": np.count_nonzero(natural),
+        "win": np.count_nonzero(win),
+        "push": np.count_nonzero(push),
+        "lose": n - np.count_nonzero(bust | natural | win | push),
+    }
+    return net, outcomes
+
+
+def _slots_chunk(n, bet, rng, symbols=SLOTS_SYMBOLS, jackpot=SLOTS_JACKPOT_MULTIPLIER, pair=SLOTS_PAIR_MULTIPLIER):
+    reels = rng.integers(0, symbols, (n, 3))
+    a, b, c = reels[:, 0], reels[:, 1], reels[:, 2]
+    triple = (a == b) & (b == c)
+    double = ~triple & ((a == b) | (b == c) | (a == c))
+    # play_slots pays winnings on top of the stake and only takes the stake on a loss
+    net = np.full(n, -bet, dtype=np.int64)
+    net[triple] = bet * jackpot
+    net[double] = bet * pair
+    outcomes = {
+        "jackpot": np.count_nonzero(triple),
+        "pair": np.count_nonzero(double),
+        "lose": n - np.count_nonzero(triple | double),
+    }
+    return net, outcomes
+
+
+def _summarize(game, plays, bet, chunks):
+    total = 0
+    total_sq = 0.0
+    inflow = 0
+    outflow = 0
+    outcomes = {}
+    for net, counts in chunks:
+        total += int(net.sum())
+        total_sq += float(np.square(net, dtype=np.float64).sum())
+        # inflow: coins minted into player balances, outflow: coins taken out
+        inflow += int(net[net > 0].sum())
+        outflow += int(-net[net < 0].sum())
+        for key, count in counts.items():
+            outcomes[key] = outcomes.get(key, 0) + int(count)
+    mean = total / plays
+    variance = total_sq / plays - mean * mean
+    return {
+        "game": game,
+        "plays": plays,
+        "bet": bet,
+        # expected player return per coin wagered, negative means the house wins
+        "ev": mean / bet,
+        "variance": variance / (bet * bet),
+        "std": (variance ** 0.5) / bet,
+        "inflow_per_1k": inflow * 1000 / plays,
+        "outflow_per_1k": outflow * 1000 / plays,
+        "net_per_1k": total * 1000 / plays,
+        "outcomes": {key: count / plays for key, count in outcomes.items()},
+    }
+
+
+def _chunked(plays, play):
+    done = 0
+    while done < plays:
+        n = min(CHUNK, plays - done)
+        yield play(n)
+        done += n
+
+
+def simulate_blackjack(plays: int = 1_000_000, bet: int = 100, stand_on: int = 17, seed=None):
+    """EV, variance and economy flow for /blackjack with a fixed bet and a hit-below-`stand_on` player.
+
+    Bet size matters: the 1.5x blackjack payout is truncated to an int.
+    """
+    rng = np.random.default_rng(seed)
+    chunks = _chunked(plays, lambda n: _blackjack_chunk(n, bet, stand_on, rng))
+    return _summarize("blackjack", plays, bet, chunks)
+
+
+def simulate_slots(plays: int = 1_000_000, bet: int = 100, symbols: int = SLOTS_SYMBOLS, jackpot: int = SLOTS_JACKPOT_MULTIPLIER, pair: int = SLOTS_PAIR_MULTIPLIER, seed=None):
+    """EV, variance and economy flow for /gamble, payout knobs default to the live values."""
+    rng = np.random.default_rng(seed)
+    chunks = _chunked(plays, lambda n: _slots_chunk(n, bet, rng, symbols, jackpot, pair))
+    return _summarize("slots", plays, bet, chunks)
+
+
+def format_report(report):
+    lines = [
+        f"{report['game']}: {report['plays']:,} plays at {report['bet']} coins",
+        f"  EV per coin bet: {report['ev']:+.4f}",
+        f"  variance: {report['variance']:.4f} bets², std {report['std']:.4f} bets",
+        f"  per 1k plays: +{report['inflow_per_1k']:,.0f} paid out, -{report['outflow_per_1k']:,.0f} taken, net {report['net_per_1k']:+,.0f}",
+    ]
+    outcomes = ", ".join(f"{key} {rate:.2%}" for key, rate in report["outcomes"].items())
+    lines.append(f"  outcomes: {outcomes}")
+    return "\n".join(lines)
@@ -0,0 +1,141 @@
+"""
+Cached phrase corpora (roasts, quips, auto reacts) so message handlers never touch disk
+"""
+
+import os
+import threading
+import time
+
+from utils.json_manager import load_json, write_json
+
+ROASTS_FILE = "data/roasts.json"
+AUTORESPONSES_FILE = "data/autoresponses.json"
+SERVER_DATA_FILE = "data/server_data.json"
+# how often (seconds) a corpus stats its file to catch hand edits
+MTIME_CHECK_INTERVAL = 30.0
+
+
+class JsonCorpus:
+    """A JSON file loaded once and turned into read-only lookups by `build`.
+
+    The file is re-stat'ed at most every `check_interval` seconds and rebuilt
+    only when its mtime moves; writers call `invalidate()` to skip the wait.
+    """
+
+    def __init__(self, path: str, build, check_interval: float = MTIME_CHECK_INTERVAL):
+        self.path = path
+        self.build = build
+        self.check_interval = check_interval
+        self._value = None
+        self._mtime = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _current_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def get(self):
+        now = time.monotonic()
+        if self._value is not None and now - self._checked_at < self.check_interval:
+            return self._value
+        with self._lock:
+            mtime = self._current_mtime()
+            self._checked_at = now
+            if self._value is None or mtime != self._mtime:
+                self._value = self.build(load_json(self.path, {}))
+                self._mtime = mtime
+            return self._value
+
+    def invalidate(self):
+        with self._lock:
+            self._value = None
+            self._checked_at = 0.0
+
+
+def _build_roasts(data: dict):
+    quips = data.get("quips") or {}
+    return {
+        "roasts": tuple(data.get("roasts") or ()),
+        "quips": {key: tuple(lines) for key, lines in quips.items()},
+    }
+
+
+def _build_autoresponses(data: dict):
+    quips = data.get("quips") or {}
+    return {"quips": tuple((key, tuple(lines)) for key, lines in quips.items())}
+
+
+def _build_auto_reacts(data: dict):
+    # guild id -> ((lowercased trigger, raw emoji), ...)
+    reacts = {}
+    for guild_id, guild_entry in data.items():
+        if not isinstance(guild_entry, dict):
+            continue
+        entries = guild_entry.get("auto_reacts") or []
+        reacts[guild_id] = tuple(
+            (entry["content"].lower().strip(), entry["emoji"])
+            for entry in entries
+            if entry.get("content") and entry.get("emoji")
+        )
+    return reacts
+
+
+def _build_flavor_stats(data: dict):
+    # guild id -> {lowercased flavor name: (flavor name, duel stats)}, only flavors that can duel
+    flavors = {}
+    for guild_id, guild_entry in data.items():
+        if not isinstance(guild_entry, dict):
+            continue
+        entries = guild_entry.get("flavor_roles") or {}
+        flavors[guild_id] = {
+            name.strip().lower(): (name, entry["duel_stats"])
+            for name, entry in entries.items()
+            if isinstance(entry, dict) and entry.get("duel_stats")
+        }
+    return flavors
+
+
+def _build_flavor_names(data: dict):
+    # guild id -> frozenset of every configured flavor role name, with or without stats
+    return {
+        guild_id: frozenset(guild_entry.get("flavor_roles") or ())
+        for guild_id, guild_entry in data.items()
+        if isinstance(guild_entry, dict)
+    }
+
+
+ROASTS = JsonCorpus(ROASTS_FILE, _build_roasts)
+AUTORESPONSES = JsonCorpus(AUTORESPONSES_FILE, _build_autoresponses)
+AUTO_REACTS = JsonCorpus(SERVER_DATA_FILE, _build_auto_reacts)
+FLAVOR_STATS = JsonCorpus(SERVER_DATA_FILE, _build_flavor_stats)
+FLAVOR_NAMES = JsonCorpus(SERVER_DATA_FILE, _build_flavor_names)
+
+
+def get_roasts():
+    return ROASTS.get()
+
+
+def get_autoresponse_quips():
+    return AUTORESPONSES.get()["quips"]
+
+
+def get_auto_reacts(guild_id: int):
+    return AUTO_REACTS.get().get(str(guild_id), ())
+
+
+def get_flavor_stats(guild_id: int):
+    return FLAVOR_STATS.get().get(str(guild_id), {})
+
+
+def get_flavor_names(guild_id: int):
+    return FLAVOR_NAMES.get().get(str(guild_id), frozenset())
+
+
+def add_roast(roast: str):
+    data = load_json(ROASTS_FILE, {})
+    data.setdefault("roasts", []).append(roast)
+    write_json(data, ROASTS_FILE)
+    ROASTS.invalidate()
@@ -0,0 +1,243 @@
+"""
+Vectorized Monte Carlo duels for checking flavor stat balance offline
+"""
+
+import copy
+
+import numpy as np
+
+from utils.corpus_manager import FLAVOR_STATS, SERVER_DATA_FILE
+from utils.json_manager import load_json, write_json
+
+# mirrors cogs/duel.py, keep in step with resolve_round
+MAX_HP = 30
+CRIT_CHANCE = 0.1
+CRIT_MULTIPLIER = 1.5
+# a duel where both keep defending never ends, call it a draw after this many rounds
+MAX_ROUNDS = 200
+# ATK points an outlier moves per unit of score away from 0.5, per rebalance step
+REBALANCE_GAIN = 12
+# (atk, def) changes tried on one flavor per fine step, the trades keep its stat total
+SINGLE_MOVES = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, -1), (-1, 1))
+
+# chance a player attacks in a given round
+STRATEGIES = {
+    "aggressive": 0.8,
+    "random": 0.5,
+    "defensive": 0.3,
+    "always_attack": 1.0,
+}
+
+
+def _crit(rng, n):
+    return np.where(rng.random(n) < CRIT_CHANCE, CRIT_MULTIPLIER, 1.0)
+
+
+def simulate_pair(p1_stats, p2_stats, duels: int = 100_000, p1_strategy="random", p2_strategy="random", rng=None):
+    """Run `duels` independent duels at once, returns (p1 win rate, p2 win rate, draw rate).
+
+    Every round is applied to all still-running duels as arrays, with the same
+    rules as resolve_round: attack vs attack ignores DEF, attacking a defender
+    does ATK - DEF, any crit is x1.5 and defending gives +1 DEF next round.
+    """
+    rng = rng or np.random.default_rng()
+    p1_attack_chance = STRATEGIES[p1_strategy]
+    p2_attack_chance = STRATEGIES[p2_strategy]
+    p1_atk, p1_def = p1_stats["atk"], p1_stats["def"]
+    p2_atk, p2_def = p2_stats["atk"], p2_stats["def"]
+
+    p1_hp = np.full(duels, MAX_HP, dtype=np.int64)
+    p2_hp = np.full(duels, MAX_HP, dtype=np.int64)
+    p1_temp = np.zeros(duels, dtype=np.int64)
+    p2_temp = np.zeros(duels, dtype=np.int64)
+    # indexes of duels still running, shrinks as they finish
+    alive = np.arange(duels)
+
+    for _ in range(MAX_ROUNDS):
+        if alive.size == 0:
+            break
+        n = alive.size
+        p1_attacks = rng.random(n) < p1_attack_chance
+        p2_attacks = rng.random(n) < p2_attack_chance
+        p1_total_def = p1_def + p1_temp[alive]
+        p2_total_def = p2_def + p2_temp[alive]
+
+        both = p1_attacks & p2_attacks
+        p1_only = p1_attacks & ~p2_attacks
+        p2_only = ~p1_attacks & p2_attacks
+
+        # np.round rounds half to even like python's round
+        p1_dmg = np.where(both, np.round(p2_atk * _crit(rng, n)), 0)
+        p2_dmg = np.where(both, np.round(p1_atk * _crit(rng, n)), 0)
+        p2_dmg = np.where(p1_only, np.round(np.maximum(0, p1_atk - p2_total_def) * _crit(rng, n)), p2_dmg)
+        p1_dmg = np.where(p2_only, np.round(np.maximum(0, p2_atk - p1_total_def) * _crit(rng, n)), p1_dmg)
+
+        p1_hp[alive] -= p1_dmg.astype(np.int64)
+        p2_hp[alive] -= p2_dmg.astype(np.int64)
+        p1_temp[alive] = ~p1_attacks
+        p2_temp[alive] = ~p2_attacks
+
+        alive = alive[(p1_hp[alive] > 0) & (p2_hp[alive] > 0)]
+
+    p1_dead = p1_hp <= 0
+    p2_dead = p2_hp <= 0
+    p1_wins = np.count_nonzero(p2_dead & ~p1_dead)
+    p2_wins = np.count_nonzero(p1_dead & ~p2_dead)
+    return p1_wins / duels, p2_wins / duels, 1 - (p1_wins + p2_wins) / duels
+
+
+def win_rate_matrix(flavors: dict, duels: int = 100_000, strategy="random", seed=None):
+    """(names, matrix) where matrix[i][j] is how often flavor i beats flavor j.
+
+    `flavors` is {name: {"atk": int, "def": int}}, each unordered pair is
+    simulated once since both players pick at the same time. Whatever is left
+    of a cell pair is draws. `seed` may be an int or a Generator.
+    """
+    rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+    names = sorted(flavors)
+    matrix = np.full((len(names), len(names)), 0.5)
+    for i, a in enumerate(names):
+        for j in range(i + 1, len(names)):
+            b = names[j]
+            a_rate, b_rate, _ = simulate_pair(flavors[a], flavors[b], duels, strategy, strategy, rng)
+            matrix[i, j] = a_rate
+            matrix[j, i] = b_rate
+    return names, matrix
+
+
+def field_scores(names, matrix):
+    """Mean score against every other flavor, a draw counts as half a win so the field averages 0.5."""
+    if len(names) < 2:
+        return dict.fromkeys(names, 0.5)
+    scores = (1 + matrix - matrix.T) / 2
+    totals = scores.sum(axis=1) - np.diag(scores)
+    return {name: float(totals[i]) / (len(names) - 1) for i, name in enumerate(names)}
+
+
+def rebalance(flavors: dict, target_spread: float = 0.1, duels: int = 20_000, strategy="random", max_steps: int = None, seed=None, initial=None):
+    """Shift stats until field scores sit within `target_spread` of each other.
+
+    Coarse steps move the ATK of every flavor outside the band toward 0.5 by a
+    number of points that grows with its distance. A step that doesn't tighten
+    the spread is undone and the step size halved. Once steps are down to
+    single points, the one SINGLE_MOVES change on one flavor that tightens
+    the spread most is applied each step, until none does. `max_steps` defaults to one per
+    flavor plus ten. `initial` is an already simulated (names, matrix) for
+    `flavors`, passing it skips the first full pass.
+
+    Returns (stats, field scores, target reached) for the closest set seen.
+    Stats are integers and one ATK point can cross a kill threshold, so a
+    tight target isn't always reachable.
+    """
+    stats = {name: {"atk": s["atk"], "def": s["def"]} for name, s in flavors.items()}
+    rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+    if max_steps is None:
+        max_steps = len(stats) + 10
+    if initial is None:
+        names, matrix = win_rate_matrix(stats, duels, strategy, rng)
+    else:
+        names, matrix = list(initial[0]), initial[1].copy()
+
+    # a matchup only depends on the two stat lines and rolled stats repeat a lot,
+    # so each (atk, def) pairing is simulated once for the whole run
+    pairs = {}
+    for i, a in enumerate(names):
+        for j, b in enumerate(names):
+            if i != j:
+                pairs[(_stat_key(stats[a]), _stat_key(stats[b]))] = matrix[i, j]
+
+    def score_field(candidate):
+        for i, a in enumerate(names):
+            for j, b in enumerate(names):
+                if i == j:
+                    continue
+                key = (_stat_key(candidate[a]), _stat_key(candidate[b]))
+                if key not in pairs:
+                    pairs[key], pairs[key[::-1]], _ = simulate_pair(candidate[a], candidate[b], duels, strategy, strategy, rng)
+                matrix[i, j] = pairs[key]
+        return field_scores(names, matrix)
+
+    scores = field_scores(names, matrix)
+    best = (_spread(scores), copy.deepcopy(stats), scores)
+    gain = REBALANCE_GAIN
+    for _ in range(max_steps):
+        if best[0] <= target_spread:
+            break
+        if gain < 1:
+            # moving several flavors a point at a time just oscillates, take the best single move
+            move = _best_single_move(best[1], best[2], target_spread, score_field)
+            if move is None:
+                break
+            best = move
+            continue
+        for name, score in scores.items():
+            distance = score - 0.5
+            if abs(distance) <= target_spread / 2:
+                continue
+            step = max(1, round(abs(distance) * gain))
+            atk = stats[name]["atk"]
+            stats[name]["atk"] = max(1, atk - step) if distance > 0 else atk + step
+        scores = score_field(stats)
+        if _spread(scores) < best[0]:
+            best = (_spread(scores), copy.deepcopy(stats), scores)
+        else:
+            # overshot, go back to the best set and take smaller steps from there
+            gain /= 2
+            stats = copy.deepcopy(best[1])
+            scores = best[2]
+    return best[1], best[2], best[0] <= target_spread
+
+
+def _best_single_move(stats, scores, target_spread, score_field):
+    # one ATK or DEF point on one outlier, whichever leaves the smallest spread
+    best = None
+    for name, score in scores.items():
+        if abs(score - 0.5) <= target_spread / 2:
+            continue
+        for atk_delta, def_delta in SINGLE_MOVES:
+            atk, def_ = stats[name]["atk"] + atk_delta, stats[name]["def"] + def_delta
+            if atk < 1 or def_ < 0:
+                continue
+            candidate = copy.deepcopy(stats)
+            candidate[name] = {"atk": atk, "def": def_}
+            candidate_scores = score_field(candidate)
+            spread = _spread(candidate_scores)
+            if spread < (best[0] if best else _spread(scores)):
+                best = (spread, candidate, candidate_scores)
+    return best
+
+
+def _stat_key(stats):
+    return stats["atk"], stats["def"]
+
+
+def _spread(scores):
+    return max(scores.values()) - min(scores.values()) if scores else 0.0
+
+
+def load_guild_flavors(guild_id, path: str = SERVER_DATA_FILE):
+    # {name: duel stats} for flavors that can duel
+    guild_entry = load_json(path, {}).get(str(guild_id), {})
+    return {
+        name: entry["duel_stats"]
+        for name, entry in (guild_entry.get("flavor_roles") or {}).items()
+        if isinstance(entry, dict) and entry.get("duel_stats")
+    }
+
+
+def save_guild_flavors(guild_id, stats: dict, path: str = SERVER_DATA_FILE):
+    data = load_json(path, {})
+    flavor_roles = data.setdefault(str(guild_id), {}).setdefault("flavor_roles", {})
+    for name, duel_stats in stats.items():
+        flavor_roles.setdefault(name, {})["duel_stats"] = {"atk": duel_stats["atk"], "def": duel_stats["def"]}
+    write_json(data, path)
+    FLAVOR_STATS.invalidate()
+
+
+def format_matrix(names, matrix, width: int = 12):
+    short = [name[:width] for name in names]
+    lines = [" " * width + " " + " ".join(f"{name:>{width}}" for name in short)]
+    for i, name in enumerate(short):
+        row = " ".join(f"{matrix[i, j]:>{width}.3f}" for j in range(len(names)))
+        lines.append(f"{name:<{width}} {row}")
+    return "\n".join(lines)
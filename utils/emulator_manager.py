@@ -1,31 +1,296 @@
-import time
+import asyncio
+import heapq
+import os
+
+import aiohttp
 import discord
 from discord import ui
-import requests
-import json
+
+from utils.json_manager import load_json_async, merge_json_async
 
 LAPTOP_IP = "100.66.147.4" # tailscale ip
 PORT = 7777  
+EMULATOR_URL = os.getenv("EMULATOR_URL", f"http://{LAPTOP_IP}:{PORT}")
+# pause the emulator needs between two presses to register both
+EMULATOR_PRESS_GAP = float(os.getenv("EMULATOR_PRESS_GAP", "0.35") or 0.35)
+# how long the relay waits for more presses to pile up before sending
+EMULATOR_BATCH_WINDOW = float(os.getenv("EMULATOR_BATCH_WINDOW", "0.05") or 0.05)
+EMULATOR_MAX_BATCH = int(os.getenv("EMULATOR_MAX_BATCH", "16") or 16)
+EMULATOR_QUEUE_SIZE = int(os.getenv("EMULATOR_QUEUE_SIZE", "200") or 200)
+# set when the emulator server has a /sequence endpoint that takes a whole batch
+EMULATOR_USE_SEQUENCE = os.getenv("EMULATOR_USE_SEQUENCE", "0") not in ("0", "false", "False", "")
+EMULATOR_REQUEST_TIMEOUT = 2
+USER_DATA_FILE = "data/user_data.json"
+# presses are written out at most this often
+PRESS_FLUSH_DELAY = 30.0
+LEADERBOARD_SIZE = 10
 
-def send_press_sequence_remote(buttons: list):
-    button_map = {"a": "A", "b": "B", "up": "Up", "down": "Down", "left": "Left", "right": "Right", "start": "Start", "select": "Select"}
-    url = f"http://{LAPTOP_IP}:{PORT}/press"
-    try:
+BUTTON_MAP = {
+    "a": "A", "b": "B", "up": "Up", "down": "Down", "left": "Left", "right": "Right",
+    "start": "Start", "select": "Select", "l": "L", "r": "R",
+}
+
+
+class InputRelay:
+    """Ordered, non-blocking queue of button presses for one emulator.
+
+    Callers enqueue and return immediately. A single worker keeps presses in
+    arrival order, drains whatever piled up within `batch_window` and sends
+    it over one keep-alive session, either as back-to-back /press calls paced
+    by `press_gap` or as a single /sequence call. The base url is a plain
+    argument so a local stub server can stand in for the emulator.
+    """
+
+    def __init__(
+        self,
+        base_url: str = EMULATOR_URL,
+        press_gap: float = EMULATOR_PRESS_GAP,
+        batch_window: float = EMULATOR_BATCH_WINDOW,
+        max_batch: int = EMULATOR_MAX_BATCH,
+        maxsize: int = EMULATOR_QUEUE_SIZE,
+        use_sequence: bool = EMULATOR_USE_SEQUENCE,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.press_gap = max(0.0, press_gap)
+        self.batch_window = max(0.0, batch_window)
+        self.max_batch = max(1, max_batch)
+        self.maxsize = max(1, maxsize)
+        self.use_sequence = use_sequence
+        self.dropped = 0
+        self.sent = 0
+        self._queue = None
+        self._session = None
+        self._task = None
+        self._last_press = 0.0
+
+    @property
+    def pending(self):
+        return self._queue.qsize() if self._queue else 0
+
+    def _ensure_worker(self):
+        if self._task is None or self._task.done():
+            if self._queue is None:
+                self._queue = asyncio.Queue(maxsize=self.maxsize)
+            self._task = asyncio.create_task(self._worker(), name="emulator-relay")
+
+    def press(self, button: str):
+        """Queue one press, returns False if the button is unknown or the queue is full."""
+        return self.sequence([button])
+
+    def sequence(self, buttons):
+        # a sequence goes in as one job so other users' presses can't land in the middle of it
+        mapped = [BUTTON_MAP.get(button.strip().lower()) for button in buttons]
+        if not mapped or None in mapped:
+            return False
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(mapped)
+        except asyncio.QueueFull:
+            # a mashing crowd can't outpace the emulator forever, newest input loses
+            self.dropped += 1
+            return False
+        return True
+
+    async def _next_batch(self):
+        batch = list(await self._queue.get())
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.batch_window
+        while len(batch) < self.max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                job = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            batch.extend(job)
+        return batch
+
+    async def _worker(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self._send(batch)
+                self.sent += len(batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print("Error sending emulator input:", e)
+
+    async def _get_session(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=1, keepalive_timeout=60)
+            timeout = aiohttp.ClientTimeout(total=EMULATOR_REQUEST_TIMEOUT)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        return self._session
+
+    async def _send(self, buttons):
+        session = await self._get_session()
+        if self.use_sequence and len(buttons) > 1:
+            # the server applies the gap, generous timeout since it holds the request open
+            timeout = aiohttp.ClientTimeout(total=EMULATOR_REQUEST_TIMEOUT + self.press_gap * len(buttons))
+            async with session.post(
+                f"{self.base_url}/sequence",
+                json={"buttons": buttons, "delay": self.press_gap},
+                timeout=timeout,
+            ) as resp:
+                resp.raise_for_status()
+            self._last_press = asyncio.get_running_loop().time()
+            return
+        loop = asyncio.get_running_loop()
         for button in buttons:
-            mapped_button = button_map[button.lower()]
-            requests.post(url, json={"button": mapped_button}, timeout=2)
-            time.sleep(0.35)  # brief pause between presses
-        print(f"Sent button sequence: {buttons}")
-    except Exception as e:
-        print("Error sending sequence:", e)
+            # keep the gap across batches too, not just inside one
+            wait = self._last_press + self.press_gap - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._last_press = loop.time()
+            async with session.post(f"{self.base_url}/press", json={"button": button}) as resp:
+                resp.raise_for_status()
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+_RELAYS = {}
+
+
+def get_input_relay(base_url: str = EMULATOR_URL):
+    # one relay (and so one ordered queue) per emulator
+    relay = _RELAYS.get(base_url)
+    if relay is None:
+        relay = _RELAYS[base_url] = InputRelay(base_url)
+    return relay
+
+
+async def close_input_relays():
+    for relay in list(_RELAYS.values()):
+        await relay.close()
+    _RELAYS.clear()
+
+
+def send_press_sequence_remote(buttons: list):
+    if get_input_relay().sequence(buttons):
+        print(f"Queued button sequence: {buttons}")
+        return True
+    print(f"Dropped button sequence: {buttons}")
+    return False
 
 def send_press_remote(button: str):
-    url = f"http://{LAPTOP_IP}:{PORT}/press"
-    try:
-        requests.post(url, json={"button": button}, timeout=2)
-        print(f"Sent button: {button}")
-    except Exception as e:
-        print("Error sending:", e)
+    return get_input_relay().press(button)
+
+
+class PressCounter:
+    """Per guild button press counts kept in memory, written to user_data.json in batches.
+
+    Each guild also keeps a min-heap of its top `top_k` pressers. Counts only
+    go up, so anyone outside the heap is never above its smallest entry, and
+    a press either bumps a heap member or swaps someone in for the smallest.
+    """
+
+    def __init__(self, path: str = USER_DATA_FILE, flush_delay: float = PRESS_FLUSH_DELAY, top_k: int = LEADERBOARD_SIZE):
+        self.path = path
+        self.flush_delay = flush_delay
+        self.top_k = top_k
+        # guild id -> {user id: count}
+        self.counts = {}
+        # guild id -> heap of [count, user id], guild id -> {user id: heap entry}
+        self._top = {}
+        self._in_top = {}
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self._dirty = {}
+        self._flush_task = None
+
+    async def load(self):
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            data = await load_json_async(self.path, {})
+            for guild_id, guild_entry in data.items():
+                if not isinstance(guild_entry, dict):
+                    continue
+                counts = {
+                    user_id: user_entry["button_pressed_count"]
+                    for user_id, user_entry in guild_entry.items()
+                    if isinstance(user_entry, dict) and user_entry.get("button_pressed_count", 0) > 0
+                }
+                if counts:
+                    self.counts[guild_id] = counts
+                    self._rebuild_top(guild_id)
+            self._loaded = True
+
+    def _rebuild_top(self, guild_id: str):
+        best = heapq.nlargest(self.top_k, self.counts[guild_id].items(), key=lambda item: item[1])
+        heap = [[count, user_id] for user_id, count in best]
+        heapq.heapify(heap)
+        self._top[guild_id] = heap
+        self._in_top[guild_id] = {entry[1]: entry for entry in heap}
+
+    async def record(self, guild_id, user_id):
+        await self.load()
+        guild_id, user_id = str(guild_id), str(user_id)
+        counts = self.counts.setdefault(guild_id, {})
+        count = counts.get(user_id, 0) + 1
+        counts[user_id] = count
+
+        heap = self._top.setdefault(guild_id, [])
+        in_top = self._in_top.setdefault(guild_id, {})
+        entry = in_top.get(user_id)
+        if entry is not None:
+            entry[0] = count
+            # the entry only grew, so it can only need to sink
+            heapq.heapify(heap)
+        elif len(heap) < self.top_k:
+            entry = [count, user_id]
+            heapq.heappush(heap, entry)
+            in_top[user_id] = entry
+        elif count > heap[0][0]:
+            entry = [count, user_id]
+            removed = heapq.heapreplace(heap, entry)
+            del in_top[removed[1]]
+            in_top[user_id] = entry
+
+        self._dirty.setdefault(guild_id, set()).add(user_id)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._delayed_flush())
+
+    async def top(self, guild_id):
+        """[(user id, count)] best first, at most top_k long."""
+        await self.load()
+        heap = self._top.get(str(guild_id), [])
+        return [(user_id, count) for count, user_id in sorted(heap, reverse=True)]
+
+    async def _delayed_flush(self):
+        await asyncio.sleep(self.flush_delay)
+        await self.flush()
+
+    async def flush(self):
+        if not self._dirty:
+            return
+        dirty, self._dirty = self._dirty, {}
+
+        def merge(data):
+            for guild_id, user_ids in dirty.items():
+                guild_entry = data.setdefault(guild_id, {})
+                for user_id in user_ids:
+                    guild_entry.setdefault(user_id, {})["button_pressed_count"] = self.counts[guild_id][user_id]
+
+        await merge_json_async(self.path, merge, {})
+
+
+_PRESS_COUNTER = PressCounter()
+
+
+def get_press_counter():
+    return _PRESS_COUNTER
 
 
 class EmulatorController(ui.View):
@@ -46,37 +311,14 @@ class EmulatorController(ui.View):
 
     async def button_callback(self, interaction: discord.Interaction):
         cmd = interaction.data["custom_id"]
-        file_path = "data/user_data.json"
-        guild_id = str(interaction.guild.id)
-        user_id = str(interaction.user.id)
         #  Send button press to emulator 
         try:
             send_press_remote(cmd)
         except Exception as e:
             print(f"Error sending button: {e}")
-        # load existing data
-        try:
-            with open(file_path, "r") as f:
-                data = json.load(f)
-                if not isinstance(data, dict):
-                    data = {}
-        except Exception:
-            data = {}
-
-        # ensure guild and user entries exist
-        data.setdefault(guild_id, {})
-        data[guild_id].setdefault(user_id, {})
-
-        # increment button press count
-        data[guild_id][user_id]["button_pressed_count"] = data[guild_id][user_id].get("button_pressed_count", 0) + 1
 
-        # write back safely
-        try:
-            with open(file_path, "w") as f:
-                json.dump(data, f, indent=4)
-        except Exception as e:
-            print(f"Error writing JSON: {e}")
+        # counted in memory, written to user_data.json in batches
+        await _PRESS_COUNTER.record(interaction.guild.id, interaction.user.id)
 
         #  silent ephemeral ack so buttons don't "spin" 
         await interaction.response.defer(ephemeral=True)
-
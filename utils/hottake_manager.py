@@ -0,0 +1,160 @@
+"""
+In-memory hot take store with an incrementally sorted score index
+"""
+
+import asyncio
+import time
+from bisect import bisect_left, insort
+
+from utils.json_manager import load_json_async, merge_json_async
+
+DATA_FILE = "data/server_data.json"
+# coalesce reaction bursts into one write
+FLUSH_DELAY = 5.0
+
+
+class HotTakeStore:
+    """All hot takes, loaded once from server_data.json.
+
+    `tracked` maps take message ids to their guild so reactions on anything
+    else bail out with one set lookup. Each guild keeps a list of
+    (score, message id) kept sorted with bisect, so /ranktakes pages are
+    slices. Changes are written back in batches after FLUSH_DELAY seconds.
+    """
+
+    def __init__(self, path: str = DATA_FILE, flush_delay: float = FLUSH_DELAY):
+        self.path = path
+        self.flush_delay = flush_delay
+        # guild id -> {message id: take}
+        self.takes = {}
+        # guild id -> sorted [(score, message id)]
+        self.ranked = {}
+        # message id -> guild id
+        self.tracked = {}
+        # takes whose counters moved from raw events since they were last checked against discord
+        self.unreconciled = set()
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self._dirty = set()
+        self._flush_task = None
+
+    async def load(self):
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            data = await load_json_async(self.path, {})
+            for guild_id, guild_entry in data.items():
+                if not isinstance(guild_entry, dict):
+                    continue
+                takes = guild_entry.get("takes") or {}
+                self.takes[guild_id] = dict(takes)
+                self.ranked[guild_id] = sorted((take.get("score", 0), msg_id) for msg_id, take in takes.items())
+                for msg_id in takes:
+                    self.tracked[msg_id] = guild_id
+            self._loaded = True
+
+    def is_take(self, message_id):
+        return str(message_id) in self.tracked
+
+    def get(self, message_id):
+        msg_id = str(message_id)
+        guild_id = self.tracked.get(msg_id)
+        if guild_id is None:
+            return None
+        return self.takes[guild_id].get(msg_id)
+
+    async def add(self, guild_id, message_id, author_id: int, take: str, channel_id: int = None):
+        await self.load()
+        guild_id, msg_id = str(guild_id), str(message_id)
+        self.takes.setdefault(guild_id, {})[msg_id] = {
+            "author": author_id,
+            "channel_id": channel_id,
+            "take": take,
+            "up": 0,
+            "down": 0,
+            "score": 0,
+            "timestamp": int(time.time()),
+        }
+        insort(self.ranked.setdefault(guild_id, []), (0, msg_id))
+        self.tracked[msg_id] = guild_id
+        self._mark_dirty(guild_id)
+
+    def set_votes(self, message_id, up: int, down: int):
+        """Update a take's counts and move it in the score index, returns the take."""
+        msg_id = str(message_id)
+        guild_id = self.tracked.get(msg_id)
+        if guild_id is None:
+            return None
+        take = self.takes[guild_id][msg_id]
+        old_score = take.get("score", 0)
+        new_score = up - down
+        take["up"] = up
+        take["down"] = down
+        take["score"] = new_score
+        if new_score != old_score:
+            ranked = self.ranked[guild_id]
+            index = bisect_left(ranked, (old_score, msg_id))
+            if index < len(ranked) and ranked[index] == (old_score, msg_id):
+                ranked.pop(index)
+            insort(ranked, (new_score, msg_id))
+        self._mark_dirty(guild_id)
+        return take
+
+    def adjust_votes(self, message_id, up_delta: int = 0, down_delta: int = 0, channel_id: int = None):
+        """Apply a raw reaction add/remove to the in-memory counters."""
+        take = self.get(message_id)
+        if take is None:
+            return None
+        if channel_id and not take.get("channel_id"):
+            # older takes predate channel tracking, learn it from the event
+            take["channel_id"] = channel_id
+        self.unreconciled.add(str(message_id))
+        return self.set_votes(
+            message_id,
+            max(0, take.get("up", 0) + up_delta),
+            max(0, take.get("down", 0) + down_delta),
+        )
+
+    def reconciled(self, message_id, up: int, down: int):
+        self.unreconciled.discard(str(message_id))
+        return self.set_votes(message_id, up, down)
+
+    def count(self, guild_id):
+        return len(self.ranked.get(str(guild_id), []))
+
+    def page(self, guild_id, page: int, page_size: int = 5):
+        """Most controversial (lowest score) first, as [(message id, take)]."""
+        guild_id = str(guild_id)
+        chunk = self.ranked.get(guild_id, [])[page * page_size:(page + 1) * page_size]
+        takes = self.takes.get(guild_id, {})
+        return [(msg_id, takes[msg_id]) for _, msg_id in chunk]
+
+    def _mark_dirty(self, guild_id: str):
+        self._dirty.add(guild_id)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._delayed_flush())
+
+    async def _delayed_flush(self):
+        await asyncio.sleep(self.flush_delay)
+        await self.flush()
+
+    async def flush(self):
+        if not self._dirty:
+            return
+        dirty, self._dirty = self._dirty, set()
+
+        def merge(data):
+            for guild_id in dirty:
+                guild_entry = data.setdefault(guild_id, {"boosters": [], "staff": [], "cooldowns": {}})
+                guild_entry["takes"] = self.takes.get(guild_id, {})
+
+        await merge_json_async(self.path, merge, {})
+
+
+_STORE = HotTakeStore()
+
+
+def get_hottake_store():
+    return _STORE
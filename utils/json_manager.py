@@ -2,7 +2,7 @@ import asyncio
 import copy
 import json
 import os
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 _FILE_LOCK = asyncio.Lock()
 
@@ -42,3 +42,15 @@ async def load_json_async(path: str, default: Optional[Any] = None) :
 async def write_json_async(data: Any, path: str) :
     async with _FILE_LOCK:
         write_json(data, path)
+
+
+async def merge_json_async(path: str, merge: Callable[[Any], None], default: Optional[Any] = None) :
+    """Apply `merge` to a fresh read of `path` and write it back in one locked step.
+
+    For stores that own a few keys of a shared file, whatever other writers
+    put there in the meantime survives.
+    """
+    async with _FILE_LOCK:
+        data = load_json(path, default)
+        merge(data)
+        write_json(data, path)
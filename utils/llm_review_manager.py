@@ -0,0 +1,617 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+import unicodedata
+from collections import OrderedDict, deque
+
+import aiohttp
+
+LLM_ENDPOINT = os.getenv("LLM_REVIEW_ENDPOINT", "http://100.66.147.4:1234/v1/chat/completions")
+# worker pool + queue sizing, tweak through env when the LM box changes
+LLM_REVIEW_WORKERS = int(os.getenv("LLM_REVIEW_WORKERS", "2") or 2)
+LLM_REVIEW_QUEUE_SIZE = int(os.getenv("LLM_REVIEW_QUEUE_SIZE", "200") or 200)
+LLM_REVIEW_BATCH_SIZE = int(os.getenv("LLM_REVIEW_BATCH_SIZE", "5") or 5)
+LLM_REVIEW_BATCH_WINDOW = float(os.getenv("LLM_REVIEW_BATCH_WINDOW", "0.5") or 0.5)
+# drop_oldest | drop_newest | block
+LLM_REVIEW_DROP_POLICY = os.getenv("LLM_REVIEW_DROP_POLICY", "drop_oldest")
+LLM_REQUEST_TIMEOUT = 60
+# seconds between stats lines in the console, 0 turns the periodic line off
+LLM_REVIEW_STATS_INTERVAL = float(os.getenv("LLM_REVIEW_STATS_INTERVAL", "900") or 0)
+# seconds shutdown waits for queued reviews before dropping the rest
+LLM_REVIEW_DRAIN_TIMEOUT = float(os.getenv("LLM_REVIEW_DRAIN_TIMEOUT", "10") or 10)
+# spam waves repeat the same text, so verdicts are reused for a while
+LLM_VERDICT_CACHE_SIZE = int(os.getenv("LLM_VERDICT_CACHE_SIZE", "2048") or 2048)
+LLM_VERDICT_CACHE_TTL = float(os.getenv("LLM_VERDICT_CACHE_TTL", "3600") or 3600)
+# "full" sends SERVER_RULES verbatim, "summary" sends the condensed rules
+# the summary drops clauses past each rule's first sentences (and unnumbered paragraphs),
+# so it is opt-in; with cache_prompt the full prefix is only processed once anyway
+LLM_REVIEW_RULES_MODE = os.getenv("LLM_REVIEW_RULES_MODE", "full")
+# stable id lets servers that key their kv cache on session reuse the prefix
+LLM_REVIEW_SESSION_ID = os.getenv("LLM_REVIEW_SESSION_ID", "dew-review")
+# llama.cpp style servers keep the shared prompt prefix warm with this flag
+LLM_REVIEW_CACHE_PROMPT = os.getenv("LLM_REVIEW_CACHE_PROMPT", "1") not in ("0", "false", "False", "")
+
+DROP_POLICIES = ("drop_oldest", "drop_newest", "block")
+_NUMBERED_LINE = re.compile(r"^\s*\[?#?(\d+)\]?\s*[.):\-]\s*(.+)$")
+_RULE_LINE = re.compile(r"^\s*(\d+|[A-Z])\)\s+(.+)$")
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+")
+_MENTION = re.compile(r"<(?:@[!&]?|#)\d+>")
+_URL = re.compile(r"https?://\S+")
+_REPEATED_CHAR = re.compile(r"(.)\1{2,}")
+_NON_WORD = re.compile(r"[^\w]+")
+
+SERVER_RULES = """
+General Rules
+(1/3)
+1) Don't Be an Ass. Generally, this should be self-explanatory: treat others and their opinions with basic respect at a minimum, and if an argument arises, please be reasonable and respectful to one another. Gratuitously confrontational and vilifying attacks are particularly prone to administrative action.
+
+2) Spam and Unacceptable Content. Spam and similarly vexing content are not tolerated. Such content includes, but is not limited to: unintelligible messages, GIF spam, repetition, and excessively annoying behavior. Please refer to the Spam Rules below for more information regarding our spam and unacceptable content guidelines.
+(2/3)
+3) Bigotry is Not Tolerated. Racist, sexist, homophobic, or otherwise bigoted and hateful content is strictly not allowed in this server. Slurs, or the encouraged usage thereof, under any context at all whatsoever, will result in a permanent ban. Blatant references to a slur or hate speech are also actionable.
+
+Additionally, intentionally disregarding other users' pronouns or gender identity is unacceptable: we have specially colored pronoun roles available for a reason. To avoid being called out for, as an example, referring to a woman as a man, please take the time to check someone's roles to make sure they're a he, she, or they. If a user's pronouns are not expressed, anything is fair game.
+(3/3)
+4) Don't Get Too Political. Controversial political statements and discussions are not allowed on this server. Such content is not allowed on profiles at all here: a moderator may ask you to edit certain parts of your profile accordingly if you are found to be in violation of this rule. The Mountain Dew server is not the place for politics, it's for Mountain Dew. Enforcement of this rule is at the sole discretion of staff.
+
+5) Don't Spread Misinformation. This server prides itself on being a source of early and accurate MTN DEW leaks. Implying blatantly false information and rumors as fact can and will result in administrative action. If you're citing a rumor or anything that is not documented in dew-news or otherwise widely known, please make the unsteady nature of the information clear.
+Spam Rules
+(1/2)
+Spam can take several forms, and each one serves as another distraction to our members. We ask of you to not be a nuisance to the server or its users, as it should be open for everyone to converse within the bounds of the rules, channel topics, and basic respect for others. These guidelines will help give you a general idea of actions and mannerisms to avoid.
+
+A) Repetition: If you're saying the same thing over and over and people are clearly annoyed with it, please cut it out. If there's minimal new content being added each time you repeat yourself for the sole purpose of annoying people, administrative action can and will be taken. Do not repeat yourself in a way that's annoying to others and contributes nothing of substance.
+(2/2)
+B) Intruding on a Conversation: When people are actively having a conversation, don't interrupt them -- for example, by bringing up a completely different topic or posting an off-topic image while people are still typing. That's straight-up rude. Do not post content that is not contextual to a conversation or channel. Discord conversations work in strange ways -- we know it well -- but please use proper discretion and be considerate of others. For more information, check out the Channel Misuse guideline below.
+
+C) General Spam: "Spam" includes stuff like copypastas, incoherent babble, sending excessive images/links/GIFs in a short period of time, reacting to messages excessively and with no context, and what we describe as "intrusive content." Intrusive content most often manifests in the form of multiple instances of annoying, meaningless junk sent with the express intent to shitpost where it is not appropriate. Intrusive content may be removed and actioned at the discretion of staff.
+Miscellaneous Guidelines
+Welcome to Dew Drinker Discord!
+Once you have introduced yourself, you will be granted access to the rest of the server and assigned a flavor role based on the flavor you named in your introduction. You may select additional roles or change your flavor role in change-your-flavor. For the latest and greatest MTN DEW leaks, upcoming releases, and more DEW-related information, check out our Dew Resources category! We have a wide variety of discussion channels here relating to Dew and Not Dew, be sure to check them out and contribute if you'd like!
+Contact the Staff Team
+If you'd like to submit a report, suggestion, or question to our team, please DM @unknown-role at the top of the right sidebar to activate Crabmail, which will let you forward your concerns to the right people on our staff team. We will discuss the situation with you and handle the situation as best we can.
+"""
+
+_INSTRUCTIONS = (
+    "You are a moderator assistant for the DEW Drinker Discord. "
+    "Review each deleted message and decide if a warning is needed. "
+    "Respond EXACTLY as `yes: <rule + brief reason>` or `no: <brief reason>`. "
+    "Cite the specific rule if warning. "
+    "When several numbered messages are given, answer each on its own line as "
+    "`<number>. yes: <rule + brief reason>` or `<number>. no: <brief reason>`.\n"
+)
+
+
+def condense_rules(rules: str, sentences: int = 2, max_chars: int = 240):
+    """Boil the rules text down to one line per numbered/lettered rule.
+
+    Each line keeps the rule label, its title and the first few sentences,
+    which is enough for the model to cite a rule without the full text.
+    Anything later in a rule, and any text outside the numbered rules, is lost.
+    """
+    lines = []
+    for line in rules.splitlines():
+        match = _RULE_LINE.match(line)
+        if not match:
+            continue
+        summary = " ".join(_SENTENCE_BREAK.split(match.group(2).strip())[:sentences])
+        if len(summary) > max_chars:
+            summary = summary[:max_chars].rsplit(" ", 1)[0] + "..."
+        lines.append(f"{match.group(1)}) {summary}")
+    return "\n".join(lines)
+
+
+RULES_SUMMARY = condense_rules(SERVER_RULES)
+
+
+def build_system_prompt(rules_mode: str = LLM_REVIEW_RULES_MODE):
+    rules = SERVER_RULES if rules_mode == "full" else RULES_SUMMARY
+    return f"{_INSTRUCTIONS}Server rules:\n{rules}"
+
+
+def normalize_content(text: str):
+    # fold away the cheap tricks spammers use to dodge exact matching
+    text = unicodedata.normalize("NFKC", text or "").casefold()
+    text = _MENTION.sub(" mention ", text)
+    text = _URL.sub(lambda match: f" {match.group(0).split('?', 1)[0]} ", text)
+    text = _REPEATED_CHAR.sub(r"\1\1", text)
+    return " ".join(_NON_WORD.sub(" ", text).split())
+
+
+def content_key(message):
+    normalized = normalize_content(message.content)
+    if not normalized:
+        return None
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+class VerdictCache:
+    """LRU of verdicts keyed by normalized content hash, entries expire after `ttl` seconds."""
+
+    def __init__(self, maxsize: int = LLM_VERDICT_CACHE_SIZE, ttl: float = LLM_VERDICT_CACHE_TTL):
+        self.maxsize = max(1, maxsize)
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        if key is None:
+            return None
+        item = self._entries.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        stored_at, verdict = item
+        if time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return verdict
+
+    def set(self, key, verdict):
+        if key is None or verdict is None:
+            return
+        self._entries[key] = (time.monotonic(), verdict)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ReviewStats:
+    """Rolling token/latency counters for review requests."""
+
+    def __init__(self, window: int = 200):
+        self.requests = 0
+        self.failures = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cached_tokens = 0
+        self.total_latency = 0.0
+        self.recent = deque(maxlen=window)
+
+    def record(self, latency: float, batch_size: int, data=None):
+        self.requests += 1
+        usage = (data or {}).get("usage") or {}
+        if not data:
+            self.failures += 1
+        prompt = usage.get("prompt_tokens") or 0
+        completion = usage.get("completion_tokens") or 0
+        cached = (usage.get("prompt_tokens_details") or {}).get("cached_tokens") or 0
+        self.prompt_tokens += prompt
+        self.completion_tokens += completion
+        self.cached_tokens += cached
+        self.total_latency += latency
+        self.recent.append(
+            {
+                "latency": latency,
+                "batch_size": batch_size,
+                "prompt_tokens": prompt,
+                "completion_tokens": completion,
+                "cached_tokens": cached,
+                "ok": bool(data),
+            }
+        )
+
+    def summary(self):
+        latencies = sorted(item["latency"] for item in self.recent)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else 0.0
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": self.cached_tokens,
+            "avg_latency": self.total_latency / self.requests if self.requests else 0.0,
+            "p95_latency": p95,
+        }
+
+    def format(self):
+        summary = self.summary()
+        return (
+            f"{summary['requests']} requests ({summary['failures']} failed), "
+            f"tokens {summary['prompt_tokens']} prompt / {summary['cached_tokens']} cached / "
+            f"{summary['completion_tokens']} completion, "
+            f"latency avg {summary['avg_latency']:.2f}s p95 {summary['p95_latency']:.2f}s"
+        )
+
+
+def _describe_message(message):
+    return (
+        f"Author: {message.author} (ID {message.author.id})\n"
+        f"Channel: {message.channel} (ID {message.channel.id})\n"
+        f"Content: {message.content or '[no content]'}"
+    )
+
+
+def _prepare_payload(messages, system_prompt=None):
+    if len(messages) == 1:
+        user_content = f"Deleted message details:\n{_describe_message(messages[0])}"
+    else:
+        blocks = [
+            f"Deleted message {index}:\n{_describe_message(message)}"
+            for index, message in enumerate(messages, start=1)
+        ]
+        user_content = "\n\n".join(blocks)
+
+    # the system message is byte-identical across calls so the server can reuse its prefix
+    payload = {
+        "model": "local",
+        "messages": [
+            {"role": "system", "content": system_prompt or build_system_prompt()},
+            {"role": "user", "content": user_content},
+        ],
+        "temperature": 0,
+        "max_tokens": min(256 * len(messages), 1024),
+        "stream": False,
+    }
+    if LLM_REVIEW_SESSION_ID:
+        payload["session_id"] = LLM_REVIEW_SESSION_ID
+    if LLM_REVIEW_CACHE_PROMPT:
+        payload["cache_prompt"] = True
+    return payload
+
+
+def _parse_verdict(text):
+    normalized = text.strip()
+    lower = normalized.lower()
+
+    if lower.startswith("yes"):
+        recommend = "yes"
+    elif lower.startswith("no"):
+        recommend = "no"
+    else:
+        return None
+
+    explanation = ""
+    if ":" in normalized:
+        explanation = normalized.split(":", 1)[1].strip()
+    elif "-" in normalized:
+        explanation = normalized.split("-", 1)[1].strip()
+    else:
+        explanation = normalized[len(recommend):].strip()
+
+    if not explanation:
+        explanation = "rule violation" if recommend == "yes" else "no warning recommended"
+
+    return {"recommend": recommend, "explanation": explanation}
+
+
+def _parse_batch_verdicts(content, count):
+    # single message keeps the old un-numbered format
+    if count == 1:
+        return [_parse_verdict(content)]
+
+    verdicts = [None] * count
+    for line in content.splitlines():
+        match = _NUMBERED_LINE.match(line)
+        if not match:
+            continue
+        index = int(match.group(1)) - 1
+        if 0 <= index < count and verdicts[index] is None:
+            verdicts[index] = _parse_verdict(match.group(2))
+    return verdicts
+
+
+def _extract_content(data):
+    try:
+        return data["choices"][0]["message"]["content"].strip()
+    except (KeyError, IndexError, AttributeError, TypeError):
+        return None
+
+
+async def _parse_llm_response(resp: aiohttp.ClientResponse):
+    content_type = resp.headers.get("Content-Type", "")
+    if "text/event-stream" in content_type:
+        return await _parse_sse_response(resp)
+
+    try:
+        return await resp.json()
+    except aiohttp.ContentTypeError:
+        return None
+
+
+async def _parse_sse_response(resp: aiohttp.ClientResponse):
+    buffer = ""
+    result_payload = None
+
+    async for chunk in resp.content.iter_chunked(1024):
+        try:
+            buffer += chunk.decode("utf-8")
+        except UnicodeDecodeError:
+            buffer += chunk.decode("utf-8", errors="ignore")
+
+        while "\n\n" in buffer:
+            block, buffer = buffer.split("\n\n", 1)
+            event_type = "message"
+            data_lines = []
+
+            for line in block.splitlines():
+                line = line.strip()
+                if not line or line.startswith(":"):
+                    continue
+                if line.startswith("event:"):
+                    event_type = line.split(":", 1)[1].strip()
+                elif line.startswith("data:"):
+                    data_lines.append(line.split(":", 1)[1].strip())
+
+            data = "\n".join(data_lines).strip()
+            if not data:
+                continue
+
+            if event_type == "error":
+                raise RuntimeError(data)
+
+            if event_type in {"result", "message", "completion"}:
+                try:
+                    result_payload = json.loads(data)
+                except json.JSONDecodeError:
+                    continue
+
+            if event_type in {"done", "end", "finish"}:
+                return result_payload
+
+    return result_payload
+
+
+class ReviewQueue:
+    """Bounded queue of deleted messages waiting on an LLM verdict.
+
+    Jobs are pulled by a small worker pool, grouped into batches so one
+    prompt covers several deletions, and sent over a shared keep-alive
+    session. The endpoint is a plain argument so a local stub server can
+    stand in for LM Studio.
+    """
+
+    def __init__(
+        self,
+        endpoint: str = LLM_ENDPOINT,
+        workers: int = LLM_REVIEW_WORKERS,
+        maxsize: int = LLM_REVIEW_QUEUE_SIZE,
+        batch_size: int = LLM_REVIEW_BATCH_SIZE,
+        batch_window: float = LLM_REVIEW_BATCH_WINDOW,
+        drop_policy: str = LLM_REVIEW_DROP_POLICY,
+        retries: int = 3,
+        rules_mode: str = LLM_REVIEW_RULES_MODE,
+    ):
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"unknown drop policy {drop_policy!r}, expected one of {DROP_POLICIES}")
+        self.endpoint = endpoint
+        self.workers = max(1, workers)
+        self.maxsize = max(1, maxsize)
+        self.batch_size = max(1, batch_size)
+        self.batch_window = max(0.0, batch_window)
+        self.drop_policy = drop_policy
+        self.retries = max(1, retries)
+        self.dropped = 0
+        self.stats = ReviewStats()
+        self.verdicts = VerdictCache()
+        # content key -> callbacks waiting on a job that is already queued
+        self._waiters = {}
+        # built once so every request shares the exact same prefix
+        self.system_prompt = build_system_prompt(rules_mode)
+        self._queue = None
+        self._session = None
+        self._tasks = []
+
+    @property
+    def pending(self):
+        return self._queue.qsize() if self._queue else 0
+
+    @property
+    def running(self):
+        return bool(self._tasks)
+
+    async def start(self):
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"llm-review-{index}")
+            for index in range(self.workers)
+        ]
+        if LLM_REVIEW_STATS_INTERVAL > 0:
+            self._tasks.append(asyncio.create_task(self._report_stats(), name="llm-review-stats"))
+
+    def report(self):
+        """One console line covering request stats, the verdict cache and drops."""
+        return (
+            f"llm review: {self.stats.format()}, "
+            f"cache {self.verdicts.hits} hits / {self.verdicts.misses} misses, "
+            f"{self.dropped} dropped"
+        )
+
+    async def _report_stats(self):
+        reported = 0
+        while True:
+            await asyncio.sleep(LLM_REVIEW_STATS_INTERVAL)
+            # quiet servers don't need the same line every interval
+            if self.stats.requests != reported:
+                reported = self.stats.requests
+                print(self.report())
+
+    async def stop(self, drain_timeout: float = 0):
+        """Cancel the workers, after waiting up to `drain_timeout` for the queue to empty."""
+        if drain_timeout > 0 and self._tasks and self._queue:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout=drain_timeout)
+            except asyncio.TimeoutError:
+                print(f"llm review shutdown dropped {self.pending} queued reviews")
+        for task in self._tasks:
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def submit(self, message, on_result):
+        """Queue a message for review, `on_result(verdict)` is awaited once done.
+
+        Cached or already-queued content is answered without a new job.
+        Returns False when the job was rejected by the drop policy.
+        """
+        key = content_key(message)
+        cached = self.verdicts.get(key)
+        if cached is not None:
+            await on_result(cached)
+            return True
+
+        # attachment-only messages have no content to share a verdict with
+        waiter_key = key or f"message:{message.id}"
+        if waiter_key in self._waiters:
+            self._waiters[waiter_key].append(on_result)
+            return True
+
+        if not self._tasks:
+            await self.start()
+
+        job = (message, key, waiter_key)
+        if self.drop_policy == "block":
+            self._waiters[waiter_key] = [on_result]
+            await self._queue.put(job)
+            return True
+
+        try:
+            self._queue.put_nowait(job)
+            self._waiters[waiter_key] = [on_result]
+            return True
+        except asyncio.QueueFull:
+            pass
+
+        self.dropped += 1
+        if self.drop_policy == "drop_newest":
+            return False
+
+        # drop_oldest: evict the head so fresh deletions still get reviewed
+        try:
+            _, _, evicted_key = self._queue.get_nowait()
+            self._waiters.pop(evicted_key, None)
+            self._queue.task_done()
+        except asyncio.QueueEmpty:
+            pass
+        self._queue.put_nowait(job)
+        self._waiters[waiter_key] = [on_result]
+        return True
+
+    async def join(self):
+        if self._queue:
+            await self._queue.join()
+
+    async def review(self, messages):
+        """Send one prompt covering `messages`, returns a verdict (or None) per message."""
+        if not messages:
+            return []
+        content = await self._ask(messages)
+        if not content:
+            return [None] * len(messages)
+        return _parse_batch_verdicts(content, len(messages))
+
+    async def _ask(self, messages):
+        """Raw model reply for one prompt covering `messages`, None if the request failed."""
+        started = time.monotonic()
+        data = await self._send(_prepare_payload(messages, self.system_prompt))
+        self.stats.record(time.monotonic() - started, len(messages), data)
+        return _extract_content(data) if data else None
+
+    async def _get_session(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.workers, keepalive_timeout=60)
+            timeout = aiohttp.ClientTimeout(total=LLM_REQUEST_TIMEOUT)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        return self._session
+
+    async def _send(self, payload):
+        session = await self._get_session()
+        for attempt in range(self.retries):
+            try:
+                async with session.post(self.endpoint, json=payload) as resp:
+                    resp.raise_for_status()
+                    data = await _parse_llm_response(resp)
+                if data:
+                    return data
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                pass
+
+            if attempt < self.retries - 1:
+                await asyncio.sleep(1 + attempt)
+
+        return None
+
+    async def _next_batch(self):
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _worker(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self._process(batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"llm review batch failed: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _process(self, batch):
+        messages = [message for message, _, _ in batch]
+        content = await self._ask(messages)
+        if content:
+            verdicts = _parse_batch_verdicts(content, len(messages))
+        else:
+            # the endpoint is down, _send already retried so the whole batch fails once
+            verdicts = [None] * len(messages)
+
+        # anything the model skipped in a batch that did answer gets one solo retry
+        if content and len(batch) > 1:
+            for index, verdict in enumerate(verdicts):
+                if verdict is None:
+                    retry = await self.review([messages[index]])
+                    verdicts[index] = retry[0]
+
+        for (message, key, waiter_key), verdict in zip(batch, verdicts):
+            self.verdicts.set(key, verdict)
+            for on_result in self._waiters.pop(waiter_key, []):
+                try:
+                    await on_result(verdict)
+                except Exception as e:
+                    print(f"llm review callback failed for {message.id}: {e}")
+
+
+_REVIEW_QUEUE = None
+
+
+def get_review_queue():
+    global _REVIEW_QUEUE
+    if _REVIEW_QUEUE is None:
+        _REVIEW_QUEUE = ReviewQueue()
+    return _REVIEW_QUEUE
+
+
+async def close_review_queue(drain_timeout: float = LLM_REVIEW_DRAIN_TIMEOUT):
+    global _REVIEW_QUEUE
+    if _REVIEW_QUEUE is not None:
+        await _REVIEW_QUEUE.stop(drain_timeout)
+        if _REVIEW_QUEUE.stats.requests:
+            print(_REVIEW_QUEUE.report())
+        _REVIEW_QUEUE = None
@@ -1,45 +1,346 @@
+import asyncio
+import json
+import os
+import random
+import re
+import sqlite3
+import threading
+
 import discord
-import json, os
+
+# quotes live next to the dew map tables so everything stays in one file
+DB_PATH = os.path.join("data", "dew_map.db")
+LEGACY_USER_DATA = "data/user_data.json"
+PAGE_SIZE = 25  # discord only allows 25 options in a select
+_SEARCH_TOKEN = re.compile(r"\w+", re.UNICODE)
+# prefixes this short match most of the table, bm25 over all of them is too slow for autocomplete
+RANKED_PREFIX_MIN = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS quotes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id TEXT NOT NULL,
+    saver_id TEXT NOT NULL,
+    author_id TEXT NOT NULL,
+    author_name TEXT NOT NULL DEFAULT '',
+    message_id TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    UNIQUE (guild_id, saver_id, message_id)
+);
+CREATE INDEX IF NOT EXISTS idx_quotes_author ON quotes (guild_id, saver_id, author_id, id);
+CREATE TABLE IF NOT EXISTS quote_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# external-content fts index over quotes, triggers keep it in step with the table.
+# prefix indexes make "x"* a single doclist read instead of a walk over every token
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS quotes_fts USING fts5(
+    content, author_name, guild_id,
+    content='quotes', content_rowid='id',
+    prefix='1 2 3'
+);
+CREATE TRIGGER IF NOT EXISTS quotes_fts_insert AFTER INSERT ON quotes BEGIN
+    INSERT INTO quotes_fts (rowid, content, author_name, guild_id)
+    VALUES (new.id, new.content, new.author_name, new.guild_id);
+END;
+CREATE TRIGGER IF NOT EXISTS quotes_fts_delete AFTER DELETE ON quotes BEGIN
+    INSERT INTO quotes_fts (quotes_fts, rowid, content, author_name, guild_id)
+    VALUES ('delete', old.id, old.content, old.author_name, old.guild_id);
+END;
+CREATE TRIGGER IF NOT EXISTS quotes_fts_update AFTER UPDATE ON quotes BEGIN
+    INSERT INTO quotes_fts (quotes_fts, rowid, content, author_name, guild_id)
+    VALUES ('delete', old.id, old.content, old.author_name, old.guild_id);
+    INSERT INTO quotes_fts (rowid, content, author_name, guild_id)
+    VALUES (new.id, new.content, new.author_name, new.guild_id);
+END;
+"""
+
+
+def _row_to_quote(row):
+    # same shape the old user_data.json recalls used
+    return {
+        "id": row["id"],
+        "guild_id": row["guild_id"],
+        "user_id": row["saver_id"],
+        "msg_author_id": row["author_id"],
+        "author_name": row["author_name"],
+        "content": row["content"],
+        "message_id": row["message_id"],
+        "timestamp": row["created_at"],
+    }
+
+
+class QuoteStore:
+    """Saved quotes in sqlite with in-memory id lists for O(1) random picks.
+
+    Rows are unique per (guild, saver, message). Id lists per saver and per
+    (saver, author) are loaded lazily from the author index and appended to
+    on save, so sampling never scans the table. Calls come from worker
+    threads, so loading a list and appending to it share one lock.
+
+    Quotes imported from user_data.json have no author name until
+    `fill_author_names` is given one from the guild's member cache.
+    """
+
+    def __init__(self, db_path: str = DB_PATH):
+        self.db_path = db_path
+        self._ready = False
+        # (guild, saver) -> [quote ids], (guild, saver, author) -> [quote ids]
+        self._by_saver = {}
+        self._by_author = {}
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def init(self):
+        if self._ready:
+            return
+        with self._lock:
+            if not self._ready:
+                self._init()
+
+    def _init(self):
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            self._ensure_columns(conn)
+            fts = conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'quotes_fts'"
+            ).fetchone()
+            if fts and "prefix=" not in fts["sql"]:
+                # built before the prefix indexes existed, the triggers survive the drop
+                conn.execute("DROP TABLE quotes_fts")
+                fts = None
+            conn.executescript(FTS_SCHEMA)
+            self._import_legacy(conn)
+            if not fts:
+                # index whatever was saved before search existed (or before the prefix indexes)
+                conn.execute("INSERT INTO quotes_fts (quotes_fts) VALUES ('rebuild')")
+            conn.commit()
+        self._ready = True
+
+    def _ensure_columns(self, conn):
+        cur = conn.execute("PRAGMA table_info(quotes)")
+        columns = {row[1] for row in cur.fetchall()}
+        if "author_name" not in columns:
+            conn.execute("ALTER TABLE quotes ADD COLUMN author_name TEXT NOT NULL DEFAULT ''")
+
+    def _import_legacy(self, conn):
+        # one-time copy of recalls that used to live in user_data.json
+        done = conn.execute("SELECT value FROM quote_meta WHERE key = 'legacy_imported'").fetchone()
+        if done or not os.path.exists(LEGACY_USER_DATA):
+            conn.execute("INSERT OR REPLACE INTO quote_meta (key, value) VALUES ('legacy_imported', '1')")
+            return
+        try:
+            with open(LEGACY_USER_DATA, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            data = {}
+        rows = []
+        for guild_id, guild_entry in data.items():
+            if not isinstance(guild_entry, dict):
+                continue
+            for saver_id, user_entry in guild_entry.items():
+                if not isinstance(user_entry, dict):
+                    continue
+                for recall in user_entry.get("recalls", []):
+                    rows.append(
+                        (
+                            str(guild_id),
+                            str(saver_id),
+                            str(recall.get("msg_author_id", "")),
+                            str(recall.get("message_id", "")),
+                            recall.get("content", ""),
+                            recall.get("timestamp", ""),
+                        )
+                    )
+        conn.executemany(
+            """
+            INSERT OR IGNORE INTO quotes (guild_id, saver_id, author_id, message_id, content, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            rows,
+        )
+        conn.execute("INSERT OR REPLACE INTO quote_meta (key, value) VALUES ('legacy_imported', '1')")
+
+    def _ids_for(self, guild_id: str, saver_id: str, author_id: str = None):
+        saver_key = (guild_id, saver_id)
+        if saver_key not in self._by_saver:
+            with self._lock:
+                self._load_ids(guild_id, saver_id)
+        if author_id is None:
+            return self._by_saver[saver_key]
+        return self._by_author.get((guild_id, saver_id, author_id), [])
+
+    def _load_ids(self, guild_id: str, saver_id: str):
+        saver_key = (guild_id, saver_id)
+        # another thread may have loaded it while this one waited on the lock
+        if saver_key in self._by_saver:
+            return
+        ids = []
+        by_author = {}
+        with self._connect() as conn:
+            cur = conn.execute(
+                "SELECT id, author_id FROM quotes WHERE guild_id = ? AND saver_id = ? ORDER BY id",
+                (guild_id, saver_id),
+            )
+            for row in cur:
+                ids.append(row["id"])
+                by_author.setdefault(row["author_id"], []).append(row["id"])
+        for author, author_ids in by_author.items():
+            self._by_author[(guild_id, saver_id, author)] = author_ids
+        # set last, the unlocked check in _ids_for treats it as fully loaded
+        self._by_saver[saver_key] = ids
+
+    def add(self, guild_id, saver_id, author_id, message_id, content, created_at, author_name=""):
+        """Insert a quote, returns False if this saver already has that message."""
+        self.init()
+        guild_id, saver_id, author_id = str(guild_id), str(saver_id), str(author_id)
+        # held across the insert so a list load can't read before it and store after it
+        with self._lock, self._connect() as conn:
+            cur = conn.execute(
+                """
+                INSERT OR IGNORE INTO quotes (guild_id, saver_id, author_id, author_name, message_id, content, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (guild_id, saver_id, author_id, author_name or "", str(message_id), content, created_at),
+            )
+            conn.commit()
+            if cur.rowcount == 0:
+                return False
+            quote_id = cur.lastrowid
+            # only touch the id lists if they were already loaded, otherwise the next load picks it up
+            if (guild_id, saver_id) in self._by_saver:
+                self._by_saver[(guild_id, saver_id)].append(quote_id)
+                self._by_author.setdefault((guild_id, saver_id, author_id), []).append(quote_id)
+        return True
+
+    def missing_author_ids(self, guild_id):
+        """Author ids in a guild with quotes that have no author name, e.g. legacy imports."""
+        self.init()
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT author_id FROM quotes WHERE guild_id = ? AND author_name = ''", (str(guild_id),)
+            ).fetchall()
+        return [row["author_id"] for row in rows]
+
+    def fill_author_names(self, guild_id, names: dict):
+        """Set author names on nameless quotes, `names` is {author id: display name}."""
+        self.init()
+        with self._connect() as conn:
+            # the update trigger reindexes the rows for search
+            conn.executemany(
+                "UPDATE quotes SET author_name = ? WHERE guild_id = ? AND author_id = ? AND author_name = ''",
+                [(name, str(guild_id), str(author_id)) for author_id, name in names.items()],
+            )
+            conn.commit()
+
+    def get(self, quote_id: int):
+        self.init()
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM quotes WHERE id = ?", (quote_id,)).fetchone()
+        return _row_to_quote(row) if row else None
+
+    def count(self, guild_id, saver_id, author_id=None):
+        self.init()
+        return len(self._ids_for(str(guild_id), str(saver_id), None if author_id is None else str(author_id)))
+
+    def random_quote(self, guild_id, saver_id, author_id=None):
+        self.init()
+        ids = self._ids_for(str(guild_id), str(saver_id), None if author_id is None else str(author_id))
+        if not ids:
+            return None
+        return self.get(random.choice(ids))
+
+    def page(self, guild_id, saver_id, author_id=None, page: int = 0, page_size: int = PAGE_SIZE):
+        """One page of a saver's quotes (optionally for one author), oldest first."""
+        self.init()
+        ids = self._ids_for(str(guild_id), str(saver_id), None if author_id is None else str(author_id))
+        # ids are kept in insertion order, which is already oldest first
+        chunk = ids[page * page_size:(page + 1) * page_size]
+        if not chunk:
+            return []
+        placeholders = ",".join("?" for _ in chunk)
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT * FROM quotes WHERE id IN ({placeholders}) ORDER BY id", chunk).fetchall()
+        return [_row_to_quote(row) for row in rows]
+
+
+    def search(self, guild_id, text: str, limit: int = PAGE_SIZE):
+        """Best matching quotes in a guild by content or author name, one per message.
+
+        The last word is treated as a prefix so results narrow while the user types.
+        A prefix shorter than RANKED_PREFIX_MIN returns the newest matches instead.
+        """
+        self.init()
+        query = build_search_query(guild_id, text)
+        if not query:
+            return []
+        tokens = _SEARCH_TOKEN.findall(text)
+        order = "rank" if len(tokens[-1]) >= RANKED_PREFIX_MIN else "quotes_fts.rowid DESC"
+        results = []
+        seen = set()
+        with self._connect() as conn:
+            cur = conn.execute(
+                f"""
+                SELECT quotes.* FROM quotes_fts
+                JOIN quotes ON quotes.id = quotes_fts.rowid
+                WHERE quotes_fts MATCH ?
+                ORDER BY {order}
+                LIMIT ?
+                """,
+                (query, limit * 4),
+            )
+            for row in cur:
+                # the same message can be saved by several people
+                if row["message_id"] in seen:
+                    continue
+                seen.add(row["message_id"])
+                results.append(_row_to_quote(row))
+                if len(results) >= limit:
+                    break
+        return results
+
+
+def build_search_query(guild_id, text: str):
+    tokens = _SEARCH_TOKEN.findall(text or "")
+    if not tokens:
+        return None
+    # quoting every token keeps fts operators in user input from doing anything
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] = f"{terms[-1]}*"
+    return f'guild_id : "{int(guild_id)}" AND {{content author_name}} : ({" ".join(terms)})'
+
+
+_STORE = QuoteStore()
+
+
+def get_quote_store():
+    return _STORE
+
 
 # saves a quote to quote list given Discord user ID, and Discord message object.
 async def save_quote(user_id: str, message: discord.Message):
-    if(not os.path.exists("data/user_data.json")):
-        with open("data/user_data.json", "w") as temp_f:
-            json.dump({}, temp_f, indent=4)
-            print("Created user_data.json file.")
-
-    with open("data/user_data.json", "r+") as f:
-        message_exists = False
-        cur_data = json.load(f)
-        guild_id_str = str(message.guild.id)
-        if guild_id_str not in cur_data:
-            cur_data[guild_id_str] = {}
-        if user_id not in cur_data[guild_id_str]:
-            cur_data[guild_id_str][user_id] = {}
-        if "recalls" not in cur_data[guild_id_str][user_id]:
-            cur_data[guild_id_str][user_id]["recalls"] = []
-        for recall in cur_data[guild_id_str][user_id]["recalls"]:
-            if(recall["message_id"] == message.id):
-                message_exists = True
-                break
-        if(message_exists == False):
-            # append the message content as a quote
-            cur_data[guild_id_str][user_id]["recalls"].append({
-                "user_id": user_id,
-                "msg_author_id": str(message.author.id),
-                "content": message.content,
-                "message_id": str(message.id),
-                "timestamp": message.created_at.isoformat()
-            })
-            f.seek(0)
-            json.dump(cur_data, f, indent=4)
-            f.truncate()
-    print("user_data quotes modified.")
-           
-async def load_quotes():
-    try:
-        with open("data/user_data.json", "r") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print("File not found!")
-        return {}
\ No newline at end of file
+    # sqlite write, kept off the event loop
+    saved = await asyncio.to_thread(
+        _STORE.add,
+        message.guild.id,
+        user_id,
+        message.author.id,
+        message.id,
+        message.content,
+        message.created_at.isoformat(),
+        author_name=message.author.display_name,
+    )
+    if saved:
+        print("quote store modified.")
+    return saved
@@ -0,0 +1,114 @@
+"""
+Process-pool backed image rendering so Pillow work stays off the event loop
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from utils import bingo_manager
+
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", "2") or 2)
+# zlib level 0-9, lower is faster to encode but bigger uploads
+RENDER_PNG_COMPRESS_LEVEL = int(os.getenv("RENDER_PNG_COMPRESS_LEVEL", "6") or 6)
+RENDER_PNG_OPTIMIZE = os.getenv("RENDER_PNG_OPTIMIZE", "0") not in ("0", "false", "False", "")
+# forkserver and spawn keep workers clear of the bot's threads and sockets, fork starts fastest.
+# with forkserver, workers fork from a clean server that already imported RENDER_PRELOAD.
+# either way every worker still re-runs main.py as __mp_main__ (imports + bot construction,
+# the __name__ guard keeps it from connecting); multiprocessing offers no way around that,
+# preloading "__main__" is a no-op on 3.11. paid once per worker, at startup or pool rebuild
+RENDER_START_METHOD = os.getenv(
+    "RENDER_START_METHOD",
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn",
+)
+RENDER_PRELOAD = ["utils.bingo_manager"]
+
+
+def _warm_worker():
+    # runs once per worker process before it takes jobs
+    bingo_manager.warm_fonts()
+
+
+class RenderService:
+    """Async front for a pool of warm Pillow worker processes.
+
+    `run` takes any picklable module-level function returning PNG bytes, so
+    new image features can reuse the same pool. If the pool breaks the job
+    falls back to a thread instead of failing the command.
+    """
+
+    def __init__(
+        self,
+        workers: int = RENDER_WORKERS,
+        compress_level: int = RENDER_PNG_COMPRESS_LEVEL,
+        optimize: bool = RENDER_PNG_OPTIMIZE,
+        start_method: str = RENDER_START_METHOD,
+    ):
+        self.workers = max(1, workers)
+        self.compress_level = min(9, max(0, compress_level))
+        self.optimize = optimize
+        self.start_method = start_method
+        self._executor = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            context = multiprocessing.get_context(self.start_method)
+            if self.start_method == "forkserver":
+                context.set_forkserver_preload(RENDER_PRELOAD)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=context,
+                initializer=_warm_worker,
+            )
+        return self._executor
+
+    def start(self):
+        # spin the workers up now rather than on the first render
+        executor = self._get_executor()
+        for _ in range(self.workers):
+            executor.submit(_warm_worker)
+
+    async def run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        except BrokenProcessPool:
+            self.shutdown()
+            return await asyncio.to_thread(func, *args)
+
+    async def render_bingo_board(self, board: bingo_manager.BingoBoard):
+        # parent-side cache hit means no pickling round trip at all
+        png = bingo_manager.cached_board_png(board, self.compress_level, self.optimize)
+        if png is not None:
+            return png
+        png = await self.run(bingo_manager.render_board_png, board, self.compress_level, self.optimize)
+        bingo_manager.remember_board_png(board, png, self.compress_level, self.optimize)
+        return png
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_RENDER_SERVICE = None
+
+
+def get_render_service():
+    global _RENDER_SERVICE
+    if _RENDER_SERVICE is None:
+        _RENDER_SERVICE = RenderService()
+    return _RENDER_SERVICE
+
+
+async def render_bingo_board(board: bingo_manager.BingoBoard):
+    return await get_render_service().render_bingo_board(board)
+
+
+def shutdown_render_service():
+    global _RENDER_SERVICE
+    if _RENDER_SERVICE is not None:
+        _RENDER_SERVICE.shutdown()
+        _RENDER_SERVICE = None
@@ -0,0 +1,82 @@
+"""
+Live member counts per role, kept current from member events instead of scanning the guild
+"""
+
+import discord
+
+
+class RoleIndex:
+    """guild id -> {role id: member count}.
+
+    A guild is counted in one pass over its cached members the first time it
+    is asked for, after that join/remove/update events adjust the counts by
+    the roles that changed. Events for guilds not indexed yet are ignored,
+    the first build picks their current state up anyway.
+    """
+
+    def __init__(self):
+        self.counts = {}
+
+    def build(self, guild: discord.Guild):
+        counts = {}
+        for member in guild.members:
+            for role in member.roles:
+                counts[role.id] = counts.get(role.id, 0) + 1
+        # a guild still chunking has a partial member cache, count it again next time
+        if guild.chunked:
+            self.counts[guild.id] = counts
+        return counts
+
+    def _guild_counts(self, guild: discord.Guild):
+        counts = self.counts.get(guild.id)
+        if counts is None:
+            counts = self.build(guild)
+        return counts
+
+    def _adjust(self, guild_id: int, role_ids, delta: int):
+        counts = self.counts.get(guild_id)
+        if counts is None:
+            return
+        for role_id in role_ids:
+            count = counts.get(role_id, 0) + delta
+            if count > 0:
+                counts[role_id] = count
+            else:
+                counts.pop(role_id, None)
+
+    def member_join(self, member: discord.Member):
+        self._adjust(member.guild.id, (role.id for role in member.roles), 1)
+
+    def member_remove(self, member: discord.Member):
+        self._adjust(member.guild.id, (role.id for role in member.roles), -1)
+
+    def member_update(self, before: discord.Member, after: discord.Member):
+        before_ids = {role.id for role in before.roles}
+        after_ids = {role.id for role in after.roles}
+        if before_ids == after_ids:
+            return
+        self._adjust(after.guild.id, after_ids - before_ids, 1)
+        self._adjust(after.guild.id, before_ids - after_ids, -1)
+
+    def role_delete(self, role: discord.Role):
+        counts = self.counts.get(role.guild.id)
+        if counts is not None:
+            counts.pop(role.id, None)
+
+    def forget(self, guild_id: int):
+        self.counts.pop(guild_id, None)
+
+    def count(self, role: discord.Role):
+        return self._guild_counts(role.guild).get(role.id, 0)
+
+    def counts_for(self, guild: discord.Guild, roles):
+        """[(role, member count)] for the given roles, one dict lookup each."""
+        counts = self._guild_counts(guild)
+        return [(role, counts.get(role.id, 0)) for role in roles]
+
+
+_ROLE_INDEX = RoleIndex()
+
+
+def get_role_index():
+    return _ROLE_INDEX
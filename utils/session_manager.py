@@ -0,0 +1,146 @@
+"""
+Restart-safe store for in-progress games (blackjack hands, duels) with TTL expiry
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import time
+
+# sessions live next to the dew map and quote tables
+DB_PATH = os.path.join("data", "dew_map.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS game_sessions (
+    kind TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    owner_id TEXT NOT NULL,
+    bet INTEGER NOT NULL DEFAULT 0,
+    channel_id TEXT,
+    message_id TEXT,
+    state TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (kind, session_id)
+);
+CREATE INDEX IF NOT EXISTS idx_game_sessions_expiry ON game_sessions (kind, expires_at);
+"""
+
+
+def _row_to_session(row):
+    return {
+        "kind": row["kind"],
+        "session_id": row["session_id"],
+        "owner_id": int(row["owner_id"]),
+        "bet": row["bet"],
+        "channel_id": int(row["channel_id"]) if row["channel_id"] else None,
+        "message_id": int(row["message_id"]) if row["message_id"] else None,
+        "state": json.loads(row["state"]),
+        "expires_at": row["expires_at"],
+    }
+
+
+class GameSessionStore:
+    """Serializable game state keyed by (kind, session id).
+
+    Cogs keep their live objects in memory and write the plain-dict form here
+    on every change, so a restart can rebuild them. `expires_at` is pushed
+    forward on each save; anything past it is handed back by `pop_expired`
+    so the owning cog can refund escrowed bets.
+
+    Cogs call the `*_async` wrappers, which run sqlite in a worker thread.
+    Writes go through one lock so an older state can't land after a newer one.
+    """
+
+    def __init__(self, db_path: str = DB_PATH):
+        self.db_path = db_path
+        self._ready = False
+        self._write_lock = asyncio.Lock()
+
+    def _connect(self):
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def init(self):
+        if self._ready:
+            return
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            conn.commit()
+        self._ready = True
+
+    def save(self, kind: str, session_id, owner_id: int, state: dict, ttl: float, bet: int = 0, channel_id=None, message_id=None):
+        self.init()
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO game_sessions
+                    (kind, session_id, owner_id, bet, channel_id, message_id, state, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    kind,
+                    str(session_id),
+                    str(owner_id),
+                    bet,
+                    str(channel_id) if channel_id else None,
+                    str(message_id) if message_id else None,
+                    json.dumps(state),
+                    time.time() + ttl,
+                ),
+            )
+            conn.commit()
+
+    def delete(self, kind: str, session_id):
+        self.init()
+        with self._connect() as conn:
+            conn.execute("DELETE FROM game_sessions WHERE kind = ? AND session_id = ?", (kind, str(session_id)))
+            conn.commit()
+
+    def load(self, kind: str):
+        """Every session of a kind that has not expired yet."""
+        self.init()
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM game_sessions WHERE kind = ? AND expires_at > ?", (kind, time.time())
+            ).fetchall()
+        return [_row_to_session(row) for row in rows]
+
+    def pop_expired(self, kind: str):
+        """Remove and return sessions past their TTL."""
+        self.init()
+        now = time.time()
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM game_sessions WHERE kind = ? AND expires_at <= ?", (kind, now)
+            ).fetchall()
+            if rows:
+                conn.execute("DELETE FROM game_sessions WHERE kind = ? AND expires_at <= ?", (kind, now))
+                conn.commit()
+        return [_row_to_session(row) for row in rows]
+
+    async def save_async(self, *args, **kwargs):
+        async with self._write_lock:
+            await asyncio.to_thread(self.save, *args, **kwargs)
+
+    async def delete_async(self, kind: str, session_id):
+        async with self._write_lock:
+            await asyncio.to_thread(self.delete, kind, session_id)
+
+    async def load_async(self, kind: str):
+        return await asyncio.to_thread(self.load, kind)
+
+    async def pop_expired_async(self, kind: str):
+        async with self._write_lock:
+            return await asyncio.to_thread(self.pop_expired, kind)
+
+
+_STORE = GameSessionStore()
+
+
+def get_session_store():
+    return _STORE